@@ -3,7 +3,7 @@ from setuptools import setup, find_packages
 
 # To use a consistent encoding
 from codecs import open
-from os import path
+from os import environ, path
 
 here = path.abspath(path.dirname(__file__))
 
@@ -15,6 +15,21 @@ with open(path.join(here, "README.md"), encoding="utf-8") as f:
 with open(path.join(here, "src", "druidry", "VERSION")) as version_file:
     version = version_file.read().strip()
 
+# Optionally compile the hot query-building modules with Cython in
+# pure-Python mode; the plain modules are used when this is not enabled.
+ext_modules = []
+if environ.get('DRUIDRY_COMPILE') == '1':
+    from Cython.Build import cythonize
+    ext_modules = cythonize(
+        [
+            path.join('src', 'druidry', 'aggregations.py'),
+            path.join('src', 'druidry', 'caseconversion.py'),
+            path.join('src', 'druidry', 'context.py'),
+            path.join('src', 'druidry', 'filters.py'),
+            path.join('src', 'druidry', 'granularities.py'),
+        ],
+        compiler_directives={'language_level': 3})
+
 setup(
     name='druidry',
     version=version,
@@ -25,13 +40,22 @@ setup(
     packages=find_packages("src"),
     package_dir={"": "src"},
     include_package_data=True,
+    ext_modules=ext_modules,
     install_requires=[
-        'decorator>=4.1.2',
         'isodate>=0.5.1',
         'pytz>=2013',
         'requests>=1.2.3'
     ],
     extras_require={
+        'async': [
+            'aiohttp>=3.8'
+        ],
+        'compile': [
+            'Cython'
+        ],
+        'json': [
+            'orjson'
+        ],
         'results': [
             'pandas>=0.12.0,<0.24'  # our code breaks somewhere above 0.24, tests catch the errors
         ],
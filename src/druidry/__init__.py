@@ -9,16 +9,17 @@ from . import filters
 from . import granularities
 from . import intervals
 from . import queries
+from . import results
 
 __all__ = [
     "aggregations", "client", "context", "errors",
-    "filters", "granularities", "intervals", "queries"
+    "filters", "granularities", "intervals", "queries", "results"
 ]
 
 try:
-    import pandas as pd
+    import aiohttp
 except ImportError:
     pass
 else:
-    from . import results
-    __all__ = __all__ + ["results"]
+    from . import async_client
+    __all__ = __all__ + ["async_client"]
@@ -10,14 +10,11 @@ from . import caseconversion
 from . import typeddict
 from .filters import Filter
 
+import functools
 import numbers
-import sys
 
-if sys.version_info >= (3, 0):
-    basestring = str
 
-
-MATHEMATICAL_AGGREGATION_TYPES = (
+MATHEMATICAL_AGGREGATION_TYPES = frozenset((
     'doubleMin',
     'doubleMax',
     'doubleSum',
@@ -25,7 +22,12 @@ MATHEMATICAL_AGGREGATION_TYPES = (
     'longMin',
     'longMax',
     'longSum'
-)
+))
+
+FIELD_NAMED_POST_AGGREGATION_TYPES = frozenset((
+    'fieldAccess',
+    'hyperUniqueCardinality'
+))
 
 
 def remove_duplicates(*aggregations):
@@ -58,10 +60,21 @@ def postagg_arithmetic(fn, operand_l, operand_r, name=None):
         'arithmetic', fields=[operand_l, operand_r], fn=fn, name=name)
 
 
+@functools.lru_cache(maxsize=256, typed=True)
+def _constant_postagg(value, name):
+    """Create the template of a constant postagg, which is only ever copied."""
+    return PostAggregation('constant', value=value, name=name)
+
+
 def to_postagg(value, name=None):
     if isinstance(value, numbers.Number):
         constant_name = "constant__{}".format(value) if name is None else name
-        return PostAggregation('constant', value=value, name=constant_name)
+        try:
+            # A constant postagg holds only scalars, so a shallow copy is independent of the template.
+            return _constant_postagg(value, constant_name).copy()
+        except TypeError:
+            # Unhashable numeric types can't be cached.
+            return PostAggregation('constant', value=value, name=constant_name)
     elif isinstance(value, Aggregation):
         return value.to_field_access(name=name)
     raise ValueError('Value must be a numeric type or an Aggregation')
@@ -74,6 +87,8 @@ class Aggregation(typeddict.TypedDict):
     Provides an instance method for applying a filter to an aggregation.
     """
 
+    __slots__ = ()
+
     @caseconversion.camel_case_kwargs
     def __init__(self, type_, **kwargs):
         """
@@ -88,7 +103,9 @@ class Aggregation(typeddict.TypedDict):
         # http://druid.io/docs/latest/querying/aggregations.html#filtered-aggregator
         if self['type'] == 'filtered':
             name = self['aggregator']['name'] if 'name' in self['aggregator'] else self['aggregator']['fieldName']
-            self['aggregator'] = dict(self['aggregator'], name=self.get('name', name))
+            name = self.get('name', name)
+            if self['aggregator'].get('name') != name:
+                Aggregation.set_aggregation_name_inplace(self, name)
 
     def _get_lookup_type(self):
         if self['type'] in MATHEMATICAL_AGGREGATION_TYPES:
@@ -97,10 +114,10 @@ class Aggregation(typeddict.TypedDict):
 
     optional_fields = {
         'filtered': {
-            'name': basestring
+            'name': str
         },
         'mathematical': {
-            'name': basestring
+            'name': str
         }
     }
 
@@ -109,15 +126,15 @@ class Aggregation(typeddict.TypedDict):
         'cardinality': {
             'byRow': bool,
             'fieldNames': list,
-            'name': basestring
+            'name': str
         },
         # http://druid.io/docs/latest/querying/aggregations.html#count-aggregator
         'count': {
-            'name': basestring
+            'name': str
         },
         # http://druid.io/docs/latest/querying/aggregations.html#hyperunique-aggregator
         'hyperUnique': {
-            'fieldName': basestring
+            'fieldName': str
         },
         'filtered': {
             'filter': dict,
@@ -126,15 +143,15 @@ class Aggregation(typeddict.TypedDict):
         # http://druid.io/docs/latest/querying/aggregations.html#javascript-aggregator
         'javascript': {
             'fieldNames': list,
-            'fnAggregate': basestring,
-            'fnCombine': basestring,
-            'fnReset': basestring,
-            'name': basestring
+            'fnAggregate': str,
+            'fnCombine': str,
+            'fnReset': str,
+            'name': str
         },
         # http://druid.io/docs/latest/querying/aggregations.html#sum-aggregators
         # http://druid.io/docs/latest/querying/aggregations.html#min-max-aggregators
         'mathematical': {
-            'fieldName': basestring
+            'fieldName': str
         }
     }
 
@@ -162,8 +179,22 @@ class Aggregation(typeddict.TypedDict):
         """Set the name for an aggregation, filtered or not."""
         if Aggregation.is_filtered_aggregation(aggregation):
             aggregator = Aggregation.get_aggregation_aggregator(aggregation)
-            return dict(aggregation, aggregator=dict(aggregator, name=name))
-        return dict(aggregation, name=name)
+            return {**aggregation, 'aggregator': {**aggregator, 'name': name}}
+        return {**aggregation, 'name': name}
+
+    @staticmethod
+    def set_aggregation_name_inplace(aggregation, name):
+        """
+        Set the name for an aggregation, filtered or not, mutating and returning it.
+
+        A filtered aggregation's aggregator may be shared with other
+        aggregations, so it is replaced rather than mutated.
+        """
+        if Aggregation.is_filtered_aggregation(aggregation):
+            aggregation['aggregator'] = {**aggregation['aggregator'], 'name': name}
+        else:
+            aggregation['name'] = name
+        return aggregation
 
     @staticmethod
     def is_filtered_aggregation(aggregation):
@@ -233,6 +264,8 @@ class Aggregation(typeddict.TypedDict):
 class FilteredAggregation(Aggregation):
     """An aggregation with a filter applied."""
 
+    __slots__ = ()
+
     @caseconversion.camel_case_kwargs
     def __init__(self, filter_, **kwargs):
         """Assign to filter and delegate to superclass."""
@@ -242,6 +275,8 @@ class FilteredAggregation(Aggregation):
 class PostAggregation(typeddict.TypedDict):
     """Base class for post-aggregations."""
 
+    __slots__ = ()
+
     @caseconversion.camel_case_kwargs
     def __init__(self, type_, **kwargs):
         """
@@ -254,43 +289,43 @@ class PostAggregation(typeddict.TypedDict):
         super(PostAggregation, self).__init__(type_, **kwargs)
 
         # http://druid.io/docs/latest/querying/aggregations.html#filtered-aggregator
-        if self['type'] in ('fieldAccess', 'hyperUniqueCardinality') and not self.get('name'):
+        if self['type'] in FIELD_NAMED_POST_AGGREGATION_TYPES and not self.get('name'):
             self['name'] = self['fieldName']
 
     required_fields = {
         # http://druid.io/docs/latest/querying/post-aggregations.html#arithmetic-post-aggregator
         'arithmetic': {
-            'name': basestring,
+            'name': str,
             'fields': list,
-            'fn': basestring
+            'fn': str
         },
         # http://druid.io/docs/latest/querying/post-aggregations.html#constant-post-aggregator
         'constant': {
-            'name': basestring,
+            'name': str,
             'value': None
         },
         # http://druid.io/docs/latest/querying/post-aggregations.html#field-accessor-post-aggregator
         'fieldAccess': {
-            'fieldName': basestring
+            'fieldName': str
         },
         # http://druid.io/docs/latest/querying/post-aggregations.html#hyperunique-cardinality-post-aggregator
         'hyperUniqueCardinality': {
-            'fieldName': basestring
+            'fieldName': str
         },
         # http://druid.io/docs/latest/querying/post-aggregations.html#javascript-post-aggregator
         'javascript': {
             'fieldNames': list,
-            'function': basestring,
-            'name': basestring
+            'function': str,
+            'name': str
         }
     }
 
     optional_fields = {
         'fieldAccess': {
-            'name': basestring
+            'name': str
         },
         'hyperUniqueCardinality': {
-            'name': basestring
+            'name': str
         }
     }
 
@@ -329,12 +364,14 @@ class PostAggregation(typeddict.TypedDict):
 class RatePostAggregation(PostAggregation):
     """Convenience class for a post-agg which is the diviosn of two fields."""
 
+    __slots__ = ()
+
     @caseconversion.camel_case_kwargs
     def __init__(self, **kwargs):
         """Allow field to be passed as an aggregation or as a string."""
         fields = [
             PostAggregation(
-                'fieldAccess', fieldName=field) if isinstance(field, basestring) else field
+                'fieldAccess', fieldName=field) if isinstance(field, str) else field
             for field in [kwargs.pop('numerator'), kwargs.pop('denominator')]
         ]
         super(RatePostAggregation, self).__init__(
@@ -0,0 +1,91 @@
+"""
+AsyncClient facilitates executing many requests to Druid concurrently over HTTP.
+
+Queries are prepared exactly as with Client, including the thread's query
+contexts, but the HTTP requests are issued with aiohttp so that independent
+queries overlap their round trips to the broker.
+"""
+import asyncio
+import datetime
+import time
+
+import aiohttp
+
+from . import client
+
+
+class AsyncClient(client.Client):
+    """AsyncClient facilitates executing concurrent requests to Druid over HTTP."""
+
+    def __init__(self, host, port, pool_size=10, **kwargs):
+        """
+        Configure the client.
+
+        Accepts the same arguments as Client. At most pool_size requests are
+        in flight to the broker at once.
+        """
+        super(AsyncClient, self).__init__(host, port, **kwargs)
+        self.pool_size = pool_size
+        self._async_session = None
+        self._async_session_loop = None
+
+    async def __aenter__(self):
+        """Allow the client to be used as an async context manager which closes its connections."""
+        return self
+
+    async def __aexit__(self, *args):
+        """Close the client's connections upon leaving the async with block."""
+        await self.close_async()
+
+    async def close_async(self):
+        """Close the connections pooled by the client."""
+        if self._async_session is not None:
+            await self._async_session.close()
+            self._async_session = None
+            self._async_session_loop = None
+        self.close()
+
+    def _get_async_session(self):
+        # The aiohttp session is bound to the event loop it was created in, so a
+        # session left over from an earlier asyncio.run is replaced rather than reused.
+        loop = asyncio.get_running_loop()
+        if self._async_session is None or self._async_session_loop is not loop:
+            self._async_session_loop = loop
+            self._async_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                headers={'Content-Type': 'application/json'})
+        return self._async_session
+
+    async def issue_request_async(self, query):
+        """
+        Execute the query by making an HTTP request.
+
+        All Druid queries are expected to return well-formed JSON, so we raise
+        an execution error if this is not the case.
+        """
+        start = time.monotonic()
+        async with self._get_async_session().post(self.endpoint, data=client._json_dumps(query)) as response:
+            content = await response.read()
+        elapsed = datetime.timedelta(seconds=time.monotonic() - start)
+        return self.parse_response(query, response.status, content, elapsed)
+
+    async def execute_query_async(self, query_obj):
+        """
+        Execute a query by making an HTTP request.
+
+        The query is prepared synchronously, so the thread's query contexts in
+        effect when this is called are applied.
+        """
+        return await self.issue_request_async(self.prepare_query(query_obj))
+
+    async def execute_many(self, query_objs):
+        """Execute the queries concurrently and return their results in order."""
+        # Prepare every query up front, while the caller's query contexts are in effect.
+        queries = [self.prepare_query(query_obj) for query_obj in query_objs]
+        semaphore = asyncio.Semaphore(self.pool_size)
+
+        async def issue_request(query):
+            async with semaphore:
+                return await self.issue_request_async(query)
+
+        return await asyncio.gather(*[issue_request(query) for query in queries])
@@ -1,22 +1,58 @@
 """Utility functions for making camel and snake case interchangable for kwarg simplicity."""
-import decorator
+import functools
+import inspect
+import sys
 
+# How many kwarg names are remembered, by _snake_to_camel and by each decorated function.
+KWARG_NAME_CACHE_SIZE = 1024
 
+
+@functools.lru_cache(maxsize=KWARG_NAME_CACHE_SIZE)
 def _snake_to_camel(snake_str):
-    return ''.join(
-        word.capitalize() if index > 0 else word
-        for index, word in enumerate(snake_str.split('_')))
+    if '_' not in snake_str:
+        return snake_str
+    first, _, rest = snake_str.partition('_')
+    # Intern the converted name so it's the same object as the literal keys it's compared against.
+    return sys.intern(first + ''.join(map(str.capitalize, rest.split('_'))))
+
+
+def _named_parameters(fn):
+    """Return the names of the parameters of fn that may be passed by keyword."""
+    return frozenset(
+        name for name, parameter in inspect.signature(fn).parameters.items()
+        if parameter.kind in (parameter.POSITIONAL_OR_KEYWORD, parameter.KEYWORD_ONLY))
 
 
-@decorator.decorator
-def camel_case_kwargs(inner_fn, *args, **kwargs):
+def camel_case_kwargs(inner_fn):
     """
     A simple decorator that converts the case of the kwargs in the callers.
 
     This allows usage like Query(query_type='timeseries') without having to
-    resort to un-pythonic camel-cased keyword arguments.
+    resort to un-pythonic camel-cased keyword arguments. Keyword arguments
+    naming one of the decorated function's own parameters are passed through
+    untouched.
     """
-    return inner_fn(*args, **{
-        _snake_to_camel(kwarg_key): kwarg_value
-        for kwarg_key, kwarg_value in kwargs.items()
-    })
+    # Map each kwarg name seen by this function to the name it's passed on as,
+    # so converting a call's kwargs takes one lookup per kwarg.
+    key_map = {name: name for name in _named_parameters(inner_fn)}
+
+    def convert_key(kwarg_key):
+        converted_key = _snake_to_camel(kwarg_key)
+        # Stop remembering names once there are many, eg. from kwargs built out of data.
+        if len(key_map) < KWARG_NAME_CACHE_SIZE:
+            key_map[kwarg_key] = converted_key
+        return converted_key
+
+    @functools.wraps(inner_fn)
+    def wrapper(*args, **kwargs):
+        # A kwarg without an underscore is never converted, so kwargs that are
+        # already camel-cased are passed on as they are.
+        for kwarg_key in kwargs:
+            if '_' in kwarg_key:
+                kwargs = {
+                    key_map[kwarg_key] if kwarg_key in key_map else convert_key(kwarg_key): kwarg_value
+                    for kwarg_key, kwarg_value in kwargs.items()
+                }
+                break
+        return inner_fn(*args, **kwargs)
+    return wrapper
@@ -6,11 +6,24 @@ The purpose of this module is just to validate and execute queries.
 import contextlib
 import json
 import requests
+import requests.adapters
 
 from . import context
 from . import errors
 
-from .queries import Query
+from .queries import Query, _json_dumps
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_loads(content):
+    """Deserialize JSON, with orjson if it is installed."""
+    if orjson is None:
+        return json.loads(content)
+    return orjson.loads(content)
 
 
 @contextlib.contextmanager
@@ -21,7 +34,9 @@ def _null_context():
 class Client(object):
     """Client facilitates executing requests to Druid over HTTP."""
 
-    def __init__(self, host, port, path='druid/v2', timeout=0, data_source=None, fetch_schema=False):
+    def __init__(
+            self, host, port, path='druid/v2', timeout=0, data_source=None, fetch_schema=False,
+            push_shared_filters=False):
         """
         Configure the client.
 
@@ -33,12 +48,26 @@ class Client(object):
 
         If fetch_schema is provided, the properties `dimensions` and `metrics`
         will be populated.
+
+        If push_shared_filters is provided, queries whose aggregations are all
+        filtered also get the union of those filters as the query filter.
         """
-        self.host = host
-        self.port = port
-        self.path = path
+        self._host = host
+        self._port = port
+        self._path = path
+        self._set_endpoints()
         self.timeout = timeout
         self.data_source = data_source
+        self.push_shared_filters = push_shared_filters
+
+        # Reuse connections to the broker across requests.
+        self._session = requests.Session()
+        self._session.mount('http://', requests.adapters.HTTPAdapter(
+            pool_connections=10, pool_maxsize=10, max_retries=0))
+        self._session.headers.update({
+            'Connection': 'keep-alive',
+            'Content-Type': 'application/json'
+        })
 
         if fetch_schema:
             self.dimensions, self.metrics = self.fetch_schema()
@@ -47,21 +76,56 @@ class Client(object):
 
     metrics = None
 
+    def __enter__(self):
+        """Allow the client to be used as a context manager which closes its connections."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the client's connections upon leaving the with block."""
+        self.close()
+
+    def close(self):
+        """Close the connections pooled by the client."""
+        self._session.close()
+
+    def _set_endpoints(self):
+        # The URLs with which to make Druid queries and metadata requests are
+        # built when the client is configured and rebuilt when host, port or path change.
+        self.endpoint = 'http://{c.host}:{c.port}/{c.path}'.format(c=self)
+        self.broker_metadata_endpoint = '{c.endpoint}/datasources'.format(c=self)
+
     @property
-    def broker_metadata_endpoint(self):
-        """Return the configured URL with which to make a metadata request."""
-        return '{c.endpoint}/datasources'.format(c=self)
+    def host(self):
+        return self._host
+
+    @host.setter
+    def host(self, host):
+        self._host = host
+        self._set_endpoints()
+
+    @property
+    def port(self):
+        return self._port
+
+    @port.setter
+    def port(self, port):
+        self._port = port
+        self._set_endpoints()
+
+    @property
+    def path(self):
+        return self._path
+
+    @path.setter
+    def path(self, path):
+        self._path = path
+        self._set_endpoints()
 
     @property
     def data_source_metadata_endpoint(self):
         """Return the configured URL with which to make a metadata request."""
         return '{c.broker_metadata_endpoint}/{c.data_source}'.format(c=self)
 
-    @property
-    def endpoint(self):
-        """Return the configured URL with which to make Druid queries."""
-        return 'http://{c.host}:{c.port}/{c.path}'.format(c=self)
-
     def fetch_schema(self):
         """Fetch the schema from the Broker for the specified dataSource."""
         if not self.data_source:
@@ -69,7 +133,7 @@ class Client(object):
 
         # It seems that the API always returns 200 with JSON content,
         # regardless of the whether the dataSource exists.
-        response = requests.get(self.data_source_metadata_endpoint)
+        response = self._session.get(self.data_source_metadata_endpoint)
         response_json = response.json()
         if type(response_json) == dict:
             return response_json.get('dimensions', []), response_json.get('metrics', [])
@@ -82,19 +146,29 @@ class Client(object):
         All Druid queries are expected to return well-formed JSON, so we raise
         an execution error if this is not the case.
         """
-        response = requests.post(self.endpoint, data=json.dumps(query))
+        response = self._session.post(self.endpoint, data=_json_dumps(query))
+        return self.parse_response(query, response.status_code, response.content, response.elapsed)
+
+    @staticmethod
+    def parse_response(query, status_code, content, elapsed=None):
+        """
+        Parse the content of a Druid response to the query.
+
+        Raise an execution error if the content is not JSON or the status code
+        does not indicate success.
+        """
         try:
-            response_json = response.json()
+            response_json = _json_loads(content)
         except ValueError:
             raise errors.DruidExecutionError(
                 'No JSON object could be decoded from the Druid response.',
-                query=query, response=response.content)
+                query=query, response=content)
 
         # Raise an exception if the status code does not indicate success.
-        if response.status_code != 200:
+        if status_code != 200:
             if response_json['error'] == 'Query timeout':
                 raise errors.DruidTimeoutError(
-                    response.elapsed, query['context']['timeout'],
+                    elapsed, query['context']['timeout'],
                     query=query, response=response_json)
             raise errors.DruidExecutionError(
                 'Druid responded with non-200 status code.',
@@ -114,19 +188,34 @@ class Client(object):
             return context.timeout_context(self.timeout)
         return _null_context()
 
+    @property
+    def _shared_filter_pushup_context(self):
+        if self.push_shared_filters:
+            return context.shared_filter_pushup_context()
+        return _null_context()
+
     def execute_query(self, query_obj):
         """
         Execute a query by making an HTTP request.
 
         The query is first validated and then executed; the response is
         inspected for validity then parsed and returned.
+
+        Query instances are shallow-copied; other dicts are first converted
+        to a Query. Query contexts therefore never mutate the query passed in.
         """
-        with self._timeout_context, self._data_source_context:
-            query = context.process_query(Query(**query_obj))
+        return self.issue_request(self.prepare_query(query_obj))
+
+    def prepare_query(self, query_obj):
+        """Apply the client's and the thread's query contexts to the query and validate it."""
+        with self._timeout_context, self._data_source_context, self._shared_filter_pushup_context:
+            # Copy Query instances without revalidating them, so contexts can't modify the caller's query.
+            query = query_obj.copy() if isinstance(query_obj, Query) else Query(**query_obj)
+            query = context.process_query(query)
 
             # Validate the structure and format of the query before executing.
             # We validate inside these context managers because otherwise we
             # might get a missing dataSource exception.
             query.validate()
 
-            return self.issue_request(query)
+            return query
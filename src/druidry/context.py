@@ -4,13 +4,13 @@ QueryContext facilitates the creation of thread-local overrides to executed quer
 Within a `with` block of a query context, the provided function will be used to
 pre-process all queries before they're excuted.
 
-QueryContexts use Ordered dict so that they are applied in the order that they
-are assigned.
+QueryContexts are kept in an insertion-ordered dict so that they are applied in
+a consistent order relative to the order in which they are assigned.
 """
-import collections
-import functools
+import json
 import threading
 
+from .aggregations import Aggregation
 from .filters import Filter
 from .intervals import Interval
 from .queries import Query
@@ -21,16 +21,35 @@ thread_context = threading.local()
 
 DRUID_QUERY_CONTEXT_KEY = 'druid_query_context'
 
+DRUID_QUERY_PROCESSOR_CHAIN_KEY = 'druid_query_processor_chain'
+
 
 def get_query_processors():
     """Get the thread-local query context processors."""
     query_context = getattr(thread_context, DRUID_QUERY_CONTEXT_KEY, None)
     if query_context is None:
-        query_context = collections.OrderedDict()
+        query_context = {}
         setattr(thread_context, DRUID_QUERY_CONTEXT_KEY, query_context)
     return query_context
 
 
+def get_query_processor_chain():
+    """
+    Get the thread-local query context processors in the order they're applied.
+
+    The chain is built once and reused until a query context is entered or exited.
+    """
+    chain = getattr(thread_context, DRUID_QUERY_PROCESSOR_CHAIN_KEY, None)
+    if chain is None:
+        chain = tuple(reversed(get_query_processors().values()))
+        setattr(thread_context, DRUID_QUERY_PROCESSOR_CHAIN_KEY, chain)
+    return chain
+
+
+def _invalidate_query_processor_chain():
+    setattr(thread_context, DRUID_QUERY_PROCESSOR_CHAIN_KEY, None)
+
+
 class QueryContext(object):
     """QueryContext assigns a pre-processor for all queries executed in a thread."""
 
@@ -51,28 +70,37 @@ class QueryContext(object):
                 'Duplicate context key: {c.context_key}'.format(c=self))
 
         processors[self.context_key] = self.context_func
+        _invalidate_query_processor_chain()
 
     def __exit__(self, *args):
         """Clean up by removing the context key from the local thread."""
         get_query_processors().pop(self.context_key)
+        _invalidate_query_processor_chain()
 
 
 def process_query(query):
-    """Apply the processors to the query and return the result."""
-    processors = get_query_processors().values()
-    processor = functools.reduce(lambda f, g: lambda v: f(g(v)), processors, lambda x: x)
-    return Query.wrap(processor(query))
+    """
+    Apply the processors to the query and return the result.
+
+    Processors are applied innermost-first, ie. the most recently entered
+    context processes the query before the contexts enclosing it.
+    """
+    chain = get_query_processor_chain()
+    if not chain:
+        return Query.wrap(query)
+    for processor in chain:
+        query = processor(query)
+    return Query.wrap(query)
 
 
 def data_source_context(data_source):
     """Convenience function for creating a query context that dictates a dataSource."""
     def add_data_source(query):
         provided_data_source = query.get('dataSource')
-        if type(provided_data_source) == dict and provided_data_source.get('type') == 'query':
-            query['dataSource']['query']['dataSource'] = data_source
-        else:
-            query['dataSource'] = data_source
-        return query
+        if isinstance(provided_data_source, dict) and provided_data_source.get('type') == 'query':
+            subquery = dict(provided_data_source['query'], dataSource=data_source)
+            return Query.extend(query, dataSource=dict(provided_data_source, query=subquery))
+        return Query.extend(query, dataSource=data_source)
     return QueryContext('dataSource', add_data_source)
 
 
@@ -93,13 +121,14 @@ def _pad_query_interval(query):
     if delta is None:
         return query
 
-    if type(query['intervals']) == list:
+    intervals = query['intervals']
+    if isinstance(intervals, list):
         intervals = [
             Interval.pad_interval_by_timedelta(interval, delta)
-            for interval in query['intervals']
+            for interval in intervals
         ]
     else:
-        intervals = Interval.pad_interval_by_timedelta(query['intervals'], delta)
+        intervals = Interval.pad_interval_by_timedelta(intervals, delta)
 
     return Query.extend(query, intervals=intervals)
 
@@ -107,3 +136,29 @@ def _pad_query_interval(query):
 def pad_query_interval_context():
     """Create a query context that pads that interval by the granularity."""
     return QueryContext('interval-padding', _pad_query_interval)
+
+
+def _push_shared_filters(query):
+    aggregations = query.get('aggregations')
+    if not aggregations or not all(Aggregation.is_filtered_aggregation(agg) for agg in aggregations):
+        return query
+
+    unique_filters = {
+        json.dumps(agg['filter'], sort_keys=True): agg['filter']
+        for agg in aggregations
+    }
+    shared_filter = Filter.disjoin_filters(*unique_filters.values())
+
+    return Query.extend(query, filter=Filter.join_filters(query.get('filter'), shared_filter))
+
+
+def shared_filter_pushup_context():
+    """
+    Create a query context that pushes the filters of filtered aggregations up to the query filter.
+
+    This only applies when every aggregation is filtered, in which case rows
+    matching none of the aggregation filters cannot contribute to the result,
+    so Druid can skip them entirely. The aggregation filters are left in place.
+    Note that groupBy results will omit groups matching none of the filters.
+    """
+    return QueryContext('shared-filter-pushup', _push_shared_filters)
@@ -24,6 +24,9 @@ Metric
 ComplexMetric
     For modeling metrics that result from multiple aggregations and/or
     post-aggregations. Facilitates building complex queries.
+DataSourceMeta
+    The metaclass of DataSourceView, which indexes the dimensions and metrics
+    of each data source class on first use and again after they change.
 DataSourceView
     An abstract class a la django.db.models.Model. When populated with
     dimensions and metrics, provides a simplified interface for building
@@ -36,16 +39,39 @@ from .intervals import Interval
 from .queries import GroupByQuery, TimeseriesQuery
 from .results import QueryResult
 
+import collections
 import datetime
-import itertools
+import functools
+import heapq
+import json
 import numbers
+import pickle
 
 
 DEFAULT_SEPARATOR = '___'
 
+# Which bound of the field an inequality sets, and whether it is strict, keyed
+# on the side of the inequality the field is on and the inequality type.
+INEQUALITY_BOUNDS = {
+    ('left', '<'): ('upper', 'upperStrict', True),
+    ('left', '<='): ('upper', 'upperStrict', False),
+    ('left', '>'): ('lower', 'lowerStrict', True),
+    ('left', '>='): ('lower', 'lowerStrict', False),
+    ('right', '<'): ('lower', 'lowerStrict', True),
+    ('right', '<='): ('lower', 'lowerStrict', False),
+    ('right', '>'): ('upper', 'upperStrict', True),
+    ('right', '>='): ('upper', 'upperStrict', False)
+}
+
+START_AFFIX_TYPES = frozenset(('startswith', 'not startswith'))
+
 
 class Dimension(object):
 
+    __slots__ = (
+        'can_split', 'dimension', 'is_multi_valued', 'name', 'ranges',
+        'name_separator', 'name_prefix', 'name_suffix', '_filter_name_format', '_range_selectors')
+
     def __init__(
             self, dimension=None, name=None, ranges=None,
             name_separator=None, name_prefix=None, name_suffix=None,
@@ -63,6 +89,12 @@ class Dimension(object):
         self.name_prefix = self.dimension if name_prefix is None else name_prefix
         self.name_suffix = '' if name_suffix is None else name_suffix
 
+        # Only the operator and choice vary between filter names, so fill in the rest once.
+        prefix, separator, suffix = (
+            part.replace('%', '%%') for part in (self.name_prefix, self.name_separator, self.name_suffix))
+        self._filter_name_format = prefix + separator + '%s' + separator + '%s' + suffix
+        self._range_selectors = None
+
     def create_bound(
             self, lower=None, upper=None, lower_strict=False,
             upper_strict=False, ordering='alphanumeric'):
@@ -72,32 +104,35 @@ class Dimension(object):
             ordering=ordering)
 
     def format_filter_name(self, choice, operator='eq'):
-        return (
-            '{self.name_prefix}{self.name_separator}'
-            '{operator}{self.name_separator}'
-            '{choice}{self.name_suffix}'
-        ).format(self=self, choice=choice, operator=operator)
+        return self._filter_name_format % (operator, choice)
 
-    def create_selector(self, value, intervals=None, filter_=None):
+    def create_selector(self, value, intervals=None, filter_=None, fetched_choices=None):
         return SelectorFilter(dimension=self.dimension, value=value)
 
     def range_selectors(self):
         if self.ranges is None:
             return []
-        return [
-            (
-                (lower, upper),
+        # Build the names and bounds on first use and again only if the ranges change,
+        # comparing against a snapshot so that ranges edited in place are noticed too.
+        ranges = tuple(tuple(range_) for range_ in self.ranges)
+        if self._range_selectors is None or self._range_selectors[0] != ranges:
+            self._range_selectors = ranges, [
                 (
-                    self.format_filter_name(','.join((lower, upper)), operator='in'),
-                    self.create_bound(lower=lower, upper=upper, upper_strict=True)
+                    (lower, upper),
+                    (
+                        self.format_filter_name(','.join((lower, upper)), operator='in'),
+                        self.create_bound(lower=lower, upper=upper, upper_strict=True)
+                    )
                 )
-            )
-            for lower, upper in self.ranges
-        ]
+                for lower, upper in ranges
+            ]
+        return list(self._range_selectors[1])
 
 
 class NumericDimension(Dimension):
 
+    __slots__ = ()
+
     type = 'numeric'
 
     def create_bound(self, **kwargs):
@@ -106,43 +141,97 @@ class NumericDimension(Dimension):
 
 class CategoricalDimension(Dimension):
 
-    def __init__(self, choices=None, allow_multiple=True, **kwargs):
+    __slots__ = (
+        '_choices', '_choice_selectors', '_fetch_choices', '_fetched_choices', 'allow_multiple', 'cache_choices')
+
+    def __init__(self, choices=None, allow_multiple=True, cache_choices=False, **kwargs):
+        """
+        Accept the choices as a list, a dict keyed by choice or a callable returning either.
+
+        If cache_choices is provided, the result of a callable is remembered for
+        each intervals and filter it's called with until invalidate_choices is called.
+        """
         self._choices = choices
+        # Decide once whether the choices need to be computed.
+        self._fetch_choices = choices if callable(choices) else (
+            lambda intervals=None, filter_=None: choices)
+        self._fetched_choices = {}
+        self._choice_selectors = None
         self.allow_multiple = allow_multiple
+        self.cache_choices = cache_choices
         super(CategoricalDimension, self).__init__(**kwargs)
 
     type = 'categorical'
 
-    def choices(self, intervals=None, filter_=None):
-        choices = self._choices(intervals=intervals, filter_=filter_) if callable(self._choices) else self._choices
+    def fetch_choices(self, intervals=None, filter_=None):
+        """Return the choices as provided, calling them for the intervals and filter if callable."""
+        if not self.cache_choices:
+            return self._fetch_choices(intervals=intervals, filter_=filter_)
+
+        try:
+            key = json.dumps([intervals, filter_], sort_keys=True)
+        except TypeError:
+            # Intervals or filters which aren't JSON serializable, eg. datetimes, can't be cached.
+            return self._fetch_choices(intervals=intervals, filter_=filter_)
+        if key not in self._fetched_choices:
+            self._fetched_choices[key] = self._fetch_choices(intervals=intervals, filter_=filter_)
+        return self._fetched_choices[key]
+
+    def invalidate_choices(self):
+        """Forget any cached results of the choices callable."""
+        self._fetched_choices.clear()
+        self._choice_selectors = None
+
+    def choices(self, intervals=None, filter_=None, fetched_choices=None):
+        choices = self.fetch_choices(intervals, filter_) if fetched_choices is None else fetched_choices
         return list(choices.keys()) if isinstance(choices, dict) else choices
 
+    def choices_filter(self, intervals=None, filter_=None, fetched_choices=None):
+        """Create an or-filter matching any of the choices."""
+        if callable(self._choices):
+            return OrFilter(fields=[
+                self.create_selector(choice, intervals, filter_, fetched_choices=fetched_choices)
+                for choice in self.choices(intervals, filter_, fetched_choices=fetched_choices)])
+
+        # Fixed choices always have the same selectors, so only create them once.
+        # Each filter gets copies of them, so modifying one doesn't change the next.
+        if self._choice_selectors is None:
+            self._choice_selectors = [self.create_selector(choice) for choice in self.choices()]
+        return OrFilter(fields=[selector.copy() for selector in self._choice_selectors])
+
 
 class GroupedCategoricalDimension(CategoricalDimension):
 
+    __slots__ = ()
+
     def __init__(self, choices, **kwargs):
         if not callable(choices):
             raise ValueError('Choices must be a callable function for GorupedCategorialDimension')
         super(GroupedCategoricalDimension, self).__init__(choices, **kwargs)
 
-    def get_choice_values(self, key, intervals=None, filter_=None):
-        choices = self._choices(intervals=intervals, filter_=filter_)
+    def get_choice_values(self, key, intervals=None, filter_=None, fetched_choices=None):
+        choices = self.fetch_choices(intervals, filter_) if fetched_choices is None else fetched_choices
         return choices[key]['group']
 
-    def create_selector(self, key, intervals, filter_):
+    def create_selector(self, key, intervals, filter_, fetched_choices=None):
         return OrFilter([
             SelectorFilter(dimension=self.dimension, value=value)
-            for value in self.get_choice_values(key, intervals, filter_)
+            for value in self.get_choice_values(key, intervals, filter_, fetched_choices)
         ])
 
 
 class Metric(object):
+
+    __slots__ = ('metric',)
+
     def __init__(self, metric):
         self.metric = metric
 
 
 class ComplexMetric(Metric):
 
+    __slots__ = ('name', 'aggregations', 'post_aggregations', 'unit')
+
     def __init__(self, metric, aggregations=None, name=None, post_aggregations=None, unit=None):
         self.metric = metric
         self.name = metric if name is None else name
@@ -151,25 +240,34 @@ class ComplexMetric(Metric):
         self.unit = unit
 
 
+def values_filter(dimension, values):
+    """
+    Select any of the values of the dimension.
+
+    A single value uses a selector filter; several use an in filter, which
+    Druid evaluates more efficiently than an or filter of selectors.
+    """
+    if len(values) == 0:
+        return None
+    if len(values) == 1:
+        return SelectorFilter(dimension=dimension, value=values[0])
+    # Match the selector filter's encoding of booleans.
+    return InFilter(dimension=dimension, values=[
+        ('t' if value else 'f') if isinstance(value, bool) else value
+        for value in values
+    ])
+
+
 def equality_filter(f):
     left, right = f['left'], f['right']
     if left['type'] == 'value' and right['type'] == 'value':
         raise ValueError('Druid does not support constant comparisons.')
     if left['type'] == 'field' and right['type'] == 'field':
         result = ColumnComparisonFilter(dimensions=[left['field'], right['field']])
-    elif left['type'] == 'field' and right['type'] == 'value' and type(right['value'])==list:
-        fields = [
-            SelectorFilter(
-                dimension=left['field'],
-                value=value)
-            for value in right['value']
-        ]
-        if len(fields) == 0:
+    elif left['type'] == 'field' and right['type'] == 'value' and isinstance(right['value'], list):
+        result = values_filter(left['field'], right['value'])
+        if result is None:
             return None
-        if len(fields) == 1:
-            result = fields[0]
-        else:
-            result = OrFilter(fields=fields)
     elif left['type'] == 'field' and right['type'] == 'value':
         result = SelectorFilter(dimension=left['field'], value=right['value'])
     elif left['type'] == 'value' and right['type'] == 'field':
@@ -179,6 +277,17 @@ def equality_filter(f):
     return result if f['type'] == '==' else result.negate()
 
 
+def _is_number(value):
+    # Check the common types directly, since isinstance checks against the
+    # numbers ABCs are comparatively slow.
+    value_type = type(value)
+    if value_type is int or value_type is float:
+        return True
+    if value_type is str:
+        return False
+    return isinstance(value, numbers.Number)
+
+
 def inequality_filter(f):
     left, right = f['left'], f['right']
     if left['type'] == 'field' and right['type'] == 'field':
@@ -189,34 +298,17 @@ def inequality_filter(f):
     value_side, field_side = ('left', 'right') if left['type'] == 'value' else ('right', 'left')
     value, field = f[value_side]['value'], f[field_side]['field']
 
-    ordering = 'numeric' if isinstance(value, numbers.Number) else 'alphanumeric'
-    strictness = f['type'] in ('<', '>')
-
-    is_left = field_side == 'left'
-    is_lower = f['type'] in ('<', '<=')
-    if (is_lower and is_left) or (not is_lower and not is_left):
-        return BoundFilter(
-            dimension=field, upper=value, ordering=ordering, upper_strict=strictness)
-    else:
-        return BoundFilter(
-            dimension=field, lower=value, ordering=ordering, lower_strict=strictness)
+    ordering = 'numeric' if _is_number(value) else 'alphanumeric'
+    bound, strict_key, strictness = INEQUALITY_BOUNDS[(field_side, f['type'])]
+    return BoundFilter(dimension=field, ordering=ordering, **{bound: value, strict_key: strictness})
 
 
 def contains_filter(f):
     if f['left']['type'] != 'field' or f['right']['type'] != 'value':
         raise ValueError('Druid does not support dynamic containment checks.')
-    fields = [
-        SelectorFilter(
-            dimension=f['left']['field'],
-            value=value)
-        for value in f['right']['value']
-    ]
-    if len(fields) == 0:
+    filter_ = values_filter(f['left']['field'], f['right']['value'])
+    if filter_ is None:
         return None
-    if len(fields) == 1:
-        filter_ = fields[0]
-    else:
-        filter_ = OrFilter(fields=fields)
 
     if f['type'] == 'in':
         return filter_
@@ -224,10 +316,25 @@ def contains_filter(f):
         return filter_.negate()
 
 
+def _build_alternation_pattern(template, values):
+    return "|".join([template.format(value) for value in values])
+
+
+_cached_alternation_pattern = functools.lru_cache(maxsize=512)(_build_alternation_pattern)
+
+
+def _alternation_pattern(template, values):
+    try:
+        return _cached_alternation_pattern(template, tuple(values))
+    except TypeError:
+        # Unhashable values can't be cached.
+        return _build_alternation_pattern(template, values)
+
+
 def regex_contain_filter(f):
     if f['left']['type'] != 'field' or f['right']['type'] != 'value':
         raise ValueError('Druid does not support dynamic patterns.')
-    pattern = "|".join([('.*{}.*').format(value) for value in f['right']['value']])
+    pattern = _alternation_pattern('.*{}.*', f['right']['value'])
     if f['type'] == 'not contains':
         return RegexFilter(
         dimension=f['left']['field'], pattern=pattern).negate()
@@ -238,8 +345,8 @@ def in_filter(f):
     if f['left']['type'] != 'field' or f['right']['type'] != 'value':
         raise ValueError('Druid does not support dynamic containment checks.')
     if f['type'] == 'in':
-        return InFilter(dimension=f['left']['field'], value=f['right']['value'])
-    return InFilter(dimension=f['left']['field'], value=f['right']['value']).negate()
+        return InFilter(dimension=f['left']['field'], values=f['right']['value'])
+    return InFilter(dimension=f['left']['field'], values=f['right']['value']).negate()
 
 def like_filter(f):
     if f['left']['type'] != 'field' or f['right']['type'] != 'value':
@@ -253,8 +360,8 @@ def like_filter(f):
 def regex_like_filter(f):
     if f['left']['type'] != 'field' or f['right']['type'] != 'value':
         raise ValueError('Druid does not support dynamic patterns.')
-    affix_start = f['type'] == 'startswith' or f['type'] == 'not startswith'
-    pattern = "|".join([('^{}.*' if affix_start else '.*{}$').format(value) for value in f['right']['value']])
+    affix_start = f['type'] in START_AFFIX_TYPES
+    pattern = _alternation_pattern('^{}.*' if affix_start else '.*{}$', f['right']['value'])
     if f['type'] == 'not startswith':
         return RegexFilter(
         dimension=f['left']['field'], pattern=pattern).negate()
@@ -263,9 +370,23 @@ def regex_like_filter(f):
 
 
 def combine_filter(f):
-    filters = [translate_filter(sf) for sf in f['filters'] if translate_filter(sf)]
+    filters = []
+    for sf in f['filters']:
+        # Skip empty subfilters here rather than calling through translate_filter for them.
+        if sf is None:
+            continue
+        tf = FILTER_TYPES[sf['type']](sf)
+        if tf is None:
+            continue
+        # Flatten nested filters of the same kind, eg. and(and(a, b), c) to and(a, b, c).
+        if tf['type'] == f['type']:
+            filters.extend(tf['fields'])
+        else:
+            filters.append(tf)
     if not filters:
         return None
+    if len(filters) == 1:
+        return filters[0]
     if f['type'] == 'and':
         return AndFilter(fields=filters)
     else:
@@ -274,8 +395,11 @@ def combine_filter(f):
 
 def negate_filter(f):
     translated_filter = translate_filter(f['filter'])
-    if not translated_filter:
+    if translated_filter is None:
         return None
+    # Cancel out double negation.
+    if translated_filter['type'] == 'not':
+        return translated_filter['field']
     return NotFilter(field=translated_filter)
 
 
@@ -299,73 +423,256 @@ FILTER_TYPES = {
 }
 
 
-def translate_filter(f):
+def translate_filter(f, _filter_types=FILTER_TYPES):
+    # FILTER_TYPES is bound as a default so each node's dispatch is a local lookup.
     if f is None:
         return f
-    return FILTER_TYPES[f['type']](f)
+    return _filter_types[f['type']](f)
+
 
+# How many compiled filters compile_filter keeps, dropping the oldest first.
+TRANSLATED_FILTER_CACHE_SIZE = 256
 
-class DataSourceView(object):
+_compiled_filters = collections.OrderedDict()
+
+
+def _filter_cache_key(f):
+    """
+    Return a hashable key identifying a filter.
+
+    Pickling is much cheaper than translating, and unlike JSON it tells apart
+    values which translate differently, eg. tuples and lists. Equal filters
+    built in a different order get different keys, which only costs a miss.
+    """
+    return pickle.dumps(f, pickle.HIGHEST_PROTOCOL)
+
+
+def _prebuilt_filter(translated_filter):
+    return lambda: translated_filter
+
+
+def compile_filter(f):
+    """
+    Translate a filter once and return a function returning the translation.
+
+    Compiling an identical filter again returns the same function, and every
+    call returns the same translation, so it must not be modified.
+    DataSourceView.get_filters accepts compiled filters as well as the filters
+    themselves, which skips looking up the compiled filter.
+    """
+    try:
+        key = _filter_cache_key(f)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        # Filters with values which can't be pickled aren't cached.
+        return _prebuilt_filter(translate_filter(f))
+    compiled_filter = _compiled_filters.get(key)
+    if compiled_filter is None:
+        compiled_filter = _compiled_filters[key] = _prebuilt_filter(translate_filter(f))
+        if len(_compiled_filters) > TRANSLATED_FILTER_CACHE_SIZE:
+            _compiled_filters.popitem(last=False)
+    return compiled_filter
+
+
+def translate_filter_cached(f):
+    """
+    Translate a filter, reusing the translation of an identical filter if there was one.
+
+    The translation is shared by every caller translating the same filter, so
+    it must not be modified.
+    """
+    if f is None:
+        return f
+    return compile_filter(f)()
+
+
+class DataSourceMeta(type):
+
+    def __setattr__(cls, name, value):
+        super(DataSourceMeta, cls).__setattr__(name, value)
+        cls._invalidate_attribute_index()
+
+    def __delattr__(cls, name):
+        super(DataSourceMeta, cls).__delattr__(name)
+        cls._invalidate_attribute_index()
+
+    def _invalidate_attribute_index(cls):
+        """Forget the index of the class and its subclasses, which may have inherited the changed attribute."""
+        classes = [cls]
+        while classes:
+            class_ = classes.pop()
+            if '_attributes' in class_.__dict__:
+                type.__delattr__(class_, '_attributes')
+            classes.extend(class_.__subclasses__())
+        # The merged (post-)aggregations may come from the old index too.
+        _merge_metric_aggregations.cache_clear()
+
+    def _get_attribute_index(cls):
+        """Return the index of the class's attributes, building it on first use after any change to them."""
+        # Each class has its own index, rather than inheriting its base's.
+        index = cls.__dict__.get('_attributes')
+        if index is None:
+            index = cls._index_attributes()
+            type.__setattr__(cls, '_attributes', index)
+        return index
+
+    def _index_attributes(cls):
+        """Collect the dimensions, metrics, aggregations and post-aggregations of the class in one pass."""
+        index = {
+            'metrics': [],
+            'aggregations': [],
+            'post_aggregations': [],
+            'metric_by_name': {},
+            'dimensions': [],
+            'dimension_by_attribute': {},
+            'dimension_by_name': {},
+            # Each metric's (post-)aggregations sorted by name, filled in as metrics are queried.
+            'sorted_aggregations': {},
+            'sorted_post_aggregations': {}
+        }
+        for attr in dir(cls):
+            item = getattr(cls, attr)
+            if isinstance(item, Metric):
+                index['metrics'].append(item)
+                index['metric_by_name'].setdefault(item.metric, item)
+            elif isinstance(item, aggregations.Aggregation):
+                index['aggregations'].append(item)
+            elif isinstance(item, aggregations.PostAggregation):
+                index['post_aggregations'].append(item)
+            elif isinstance(item, Dimension):
+                index['dimensions'].append(item)
+                index['dimension_by_attribute'][attr] = item
+                index['dimension_by_name'].setdefault(item.dimension, item)
+        return index
+
+
+@functools.lru_cache(maxsize=256)
+def _merge_metric_aggregations(data_source_class, key, metrics):
+    """Merge the sorted (post-)aggregations of the metrics, remembering the most recently queried lists of metrics."""
+    return data_source_class._merge_sorted_aggregations(
+        [data_source_class._get_sorted_aggregations(key, m) for m in metrics])
+
+
+class DataSourceView(object, metaclass=DataSourceMeta):
 
     def __init__(self):
         pass
 
+    @classmethod
+    def _attribute_index(cls):
+        return cls._get_attribute_index()
+
+    @classmethod
+    def dimensions(cls):
+        return list(cls._attribute_index()['dimensions'])
+
     @classmethod
     def metrics(cls):
-        items = [getattr(cls, attr) for attr in dir(cls)]
-        return [item for item in items if isinstance(item, Metric)]
+        return list(cls._attribute_index()['metrics'])
 
     @classmethod
     def aggregations(cls):
-        items = [getattr(cls, attr) for attr in dir(cls)]
-        return [item for item in items if isinstance(item, aggregations.Aggregation)]
+        return list(cls._attribute_index()['aggregations'])
 
     @classmethod
     def post_aggregations(cls):
-        items = [getattr(cls, attr) for attr in dir(cls)]
-        return [item for item in items if isinstance(item, aggregations.PostAggregation)]
+        return list(cls._attribute_index()['post_aggregations'])
 
     def get_filters(self, filters):
-        return translate_filter(filters)
+        """Translate the filters, which may have been compiled by compile_filter."""
+        if not callable(filters):
+            filters = compile_filter(filters)
+        return filters()
 
     def get_metric(self, name):
-        return next((m for m in self.metrics() if m.metric == name), None)
+        return self._attribute_index()['metric_by_name'].get(name)
 
     def get_dimension(self, name):
-        dimension = getattr(self, name)
-        if isinstance(dimension, Dimension):
-            return dimension
-        else:
-            None
+        """Get a dimension by its attribute name, or else by its Druid dimension name."""
+        index = self._attribute_index()
+        dimension = index['dimension_by_attribute'].get(name)
+        if dimension is None:
+            return index['dimension_by_name'].get(name)
+        return dimension
+
+    @staticmethod
+    def _merge_sorted_aggregations(sorted_aggregations):
+        """
+        Merge lists of aggregations sorted by name into one, removing duplicates by name.
+
+        Like remove_duplicates, the last of the aggregations sharing a name is kept.
+        """
+        get_name = aggregations.Aggregation.get_aggregation_name
+        merged = []
+        merged_name = None
+        for aggregation in heapq.merge(*sorted_aggregations, key=get_name):
+            name = get_name(aggregation)
+            if merged and name == merged_name:
+                merged[-1] = aggregation
+            else:
+                merged.append(aggregation)
+                merged_name = name
+        return merged
 
-    def get_aggregations(self, metrics):
-        metrics_aggs = itertools.chain.from_iterable(
-            self.get_metric(m).aggregations for m in metrics)
+    @classmethod
+    def _get_sorted_aggregations(cls, key, name):
+        """Return the metric's (post-)aggregations sorted by name, sorting them on first use."""
+        index = cls._attribute_index()
+        sorted_aggregations = index[key]
+        try:
+            return sorted_aggregations[name]
+        except KeyError:
+            metric = index['metric_by_name'].get(name)
+        except TypeError:
+            # An unhashable name can't name a metric.
+            metric = None
+        if metric is None:
+            raise AttributeError('{} has no metric {!r}'.format(cls.__name__, name))
+        attr = 'aggregations' if key == 'sorted_aggregations' else 'post_aggregations'
+        sorted_aggregations[name] = sorted(
+            getattr(metric, attr), key=aggregations.Aggregation.get_aggregation_name)
+        return sorted_aggregations[name]
+
+    def _get_merged_aggregations(self, key, metrics):
+        metrics = () if metrics is None else tuple(metrics)
+        try:
+            merged = _merge_metric_aggregations(type(self), key, metrics)
+        except TypeError:
+            # Lists of metrics with unhashable entries can't be cached, so merge them directly.
+            merged = _merge_metric_aggregations.__wrapped__(type(self), key, metrics)
+        return list(merged)
 
-        return sorted(
-            aggregations.remove_duplicates(*metrics_aggs),
-            key=aggregations.Aggregation.get_aggregation_name)
+    def get_aggregations(self, metrics):
+        return self._get_merged_aggregations('sorted_aggregations', metrics)
 
     def get_post_aggregations(self, metrics):
-        metrics_postaggs = itertools.chain.from_iterable(
-            self.get_metric(m).post_aggregations for m in metrics)
-
-        return sorted(
-            aggregations.remove_duplicates(*metrics_postaggs),
-            key=aggregations.Aggregation.get_aggregation_name)
-
-    def get_filter_for_dimension_choices(self, dimension, split, intervals=None, filter_=None):
-        choices = dimension.choices(intervals, filter_)
-        return (OrFilter(fields=[dimension.create_selector(choice, intervals, filter_) for choice in choices]),
+        return self._get_merged_aggregations('sorted_post_aggregations', metrics)
+
+    def get_filter_for_dimension_choices(self, dimension, split, intervals=None, filter_=None, fetched_choices=None):
+        # Fetch the choices once, since they may be computed by an expensive callable.
+        if fetched_choices is None:
+            fetched_choices = dimension.fetch_choices(intervals, filter_)
+        choices = dimension.choices(intervals, filter_, fetched_choices=fetched_choices)
+        return (dimension.choices_filter(intervals, filter_, fetched_choices=fetched_choices),
                 ListFilter(dimension.dimension, split, choices))
 
     def get_split_exclusion_filter(self, splits, intervals=None, filter_=None):
         if splits:
+            dimensions = [self.get_dimension(split) for split in splits]
+            for split, dimension in zip(splits, dimensions):
+                if dimension is None:
+                    raise AttributeError('{} has no dimension {!r}'.format(type(self).__name__, split))
+
+            # Fetch the choices once per distinct dimension, however many splits use it.
+            fetched_choices = {}
+            for dimension in dimensions:
+                if id(dimension) not in fetched_choices:
+                    fetched_choices[id(dimension)] = dimension.fetch_choices(intervals, filter_)
+
             filters = []
             dimension_filters = []
-            for split in splits:
-                dimension = self.get_dimension(split)
-                f, df = self.get_filter_for_dimension_choices(dimension, split, intervals, filter_)
+            for split, dimension in zip(splits, dimensions):
+                f, df = self.get_filter_for_dimension_choices(
+                    dimension, split, intervals, filter_, fetched_choices=fetched_choices[id(dimension)])
                 filters.append(f)
                 dimension_filters.append(df)
             return (AndFilter(fields=filters), dimension_filters)
@@ -375,6 +682,24 @@ class DataSourceView(object):
             self, end=None, start=None, metrics=None, splits=None,
             duration=None, granularity='all', filters=None, intervals=None,
             exclude_other_splits=False):
+        return self._build_query(
+            self.get_aggregations(metrics), self.get_post_aggregations(metrics),
+            end=end, start=start, splits=splits, duration=duration, granularity=granularity,
+            filters=filters, intervals=intervals, exclude_other_splits=exclude_other_splits)
+
+    def get_query_many(self, query_specs):
+        """
+        Build a query for each dict of get_query kwargs.
+
+        The aggregations and post-aggregations of each distinct list of
+        metrics are merged once and reused, here as for get_query.
+        """
+        return [self.get_query(**query_spec) for query_spec in query_specs]
+
+    def _build_query(
+            self, aggs, postaggs, end=None, start=None, splits=None,
+            duration=None, granularity='all', filters=None, intervals=None,
+            exclude_other_splits=False):
 
         filter_ = self.get_filters(filters)
 
@@ -392,30 +717,45 @@ class DataSourceView(object):
             split_exclusion_filter, split_exclusion_dimension = \
                 self.get_split_exclusion_filter(splits, intervals, filter_)
 
+        # Join the split exclusion filters alongside the translated filter in a
+        # single and-filter, rather than nesting one and-filter in another.
         if split_exclusion_filter and filter_:
-            filter_ = AndFilter(fields=[filter_, split_exclusion_filter])
+            filter_ = AndFilter(fields=[filter_] + split_exclusion_filter['fields'])
         elif split_exclusion_filter:
             filter_ = split_exclusion_filter
 
-        aggs = self.get_aggregations(metrics)
-        postaggs = self.get_post_aggregations(metrics)
-
         kwargs = {
             'aggregations': aggs,
             'granularity': granularity,
             'intervals': intervals,
             'post_aggregations': postaggs,
         }
+        # Build the query with its filter at once instead of re-creating it to add the filter.
+        if filter_:
+            kwargs['filter'] = filter_
         if splits:
-            query = GroupByQuery(
+            return GroupByQuery(
                 dimensions=split_exclusion_dimension if split_exclusion_dimension else splits,
                 **kwargs)
-        else:
-            query = TimeseriesQuery(**kwargs)
-        return query.filter(filter_) if filter_ else query
-
-    def filter_result(self, result, metric):
-        return {k: v for k, v in result.items() if k.startswith(metric)}
+        return TimeseriesQuery(**kwargs)
+
+    def filter_result(self, result, metric, matching_keys=None):
+        if matching_keys is None:
+            return {k: v for k, v in result.items() if k.startswith(metric)}
+        return {k: result[k] for k in matching_keys}
+
+    def filter_results(self, results, metric):
+        """Filter result rows, matching their keys against the metric again only when they differ from the last row's."""
+        keys = None
+        matching_keys = None
+        filtered_results = []
+        for result in results:
+            # Rows needn't share keys, eg. when they omit null metrics.
+            if result.keys() != keys:
+                keys = set(result)
+                matching_keys = tuple(k for k in result if k.startswith(metric))
+            filtered_results.append(self.filter_result(result, metric, matching_keys))
+        return filtered_results
 
     def execute_query(self, executor, **kwargs):
         query = self.get_query(**kwargs)
@@ -1,11 +1,8 @@
 """Duration and interval building utility methods."""
 
 import datetime
+import functools
 import isodate
-import sys
-
-if sys.version_info >= (3, 0):
-    basestring = str
 
 DURATION_KWARGS = (
     'years',
@@ -24,10 +21,28 @@ DATE_TIME_UNITS = ['year', 'month', 'day', 'hour', 'minute', 'second', 'microsec
 
 TIME_DELTA_THRESHOLDS = list(zip(TIME_DELTA_UNITS, DATE_TIME_UNITS[2:]))
 
+# Each datetime unit with a timedelta of one of it, largest first.
+UNITARY_TIMEDELTAS = [
+    (datetime.timedelta(**{td_unit: 1}), dt_unit) for td_unit, dt_unit in TIME_DELTA_THRESHOLDS]
+
+UNITARY_TIMEDELTA_BY_UNIT = {dt_unit: unitary_timedelta for unitary_timedelta, dt_unit in UNITARY_TIMEDELTAS}
+
+# The datetime.replace kwargs which floor a datetime to each unit.
+FLOOR_KWARGS_BY_UNIT = {
+    unit: {smaller_unit: 0 for smaller_unit in DATE_TIME_UNITS[i + 1:]}
+    for i, unit in enumerate(DATE_TIME_UNITS)
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_duration(duration):
+    # The same few duration strings are parsed over and over, so remember them.
+    return isodate.parse_duration(duration)
+
 
 def validate_duration(duration):
     """Validate that the duration string is an ISO-8601 duration."""
-    isodate.parse_duration(duration)
+    _parse_duration(duration)
 
 
 def has_duration_kwarg(**kwargs):
@@ -37,9 +52,21 @@ def has_duration_kwarg(**kwargs):
 
 def duration_kwargs_to_isoformat(**kwargs):
     """Take kwargs, filter to just duration kwargs, get an isoduration str."""
-    duration = isodate.duration.Duration(
-        **{kwarg: kwargs[kwarg] for kwarg in DURATION_KWARGS if kwarg in kwargs})
-    return isodate.duration_isoformat(duration)
+    # Key on the types too, since eg. years=1 and years=1.0 format differently.
+    return _duration_isoformat(tuple(
+        (kwarg, type(kwargs[kwarg]), kwargs[kwarg]) for kwarg in DURATION_KWARGS if kwarg in kwargs))
+
+
+@functools.lru_cache(maxsize=128)
+def timedelta_isoformat(td):
+    """Format a timedelta as an ISO-8601 duration, remembering the most recent ones."""
+    return isodate.duration_isoformat(td)
+
+
+@functools.lru_cache(maxsize=256)
+def _duration_isoformat(duration_kwargs):
+    return isodate.duration_isoformat(isodate.duration.Duration(
+        **{kwarg: value for kwarg, _, value in duration_kwargs}))
 
 
 def get_timedelta_unit(td):
@@ -49,8 +76,8 @@ def get_timedelta_unit(td):
     So if a timedelta is 12 days, return 'day'. If a timedelta is 1 day, return
     'day'. If a timedelta is 45 minutes, return 'minute'.
     """
-    for td_unit, dt_unit in TIME_DELTA_THRESHOLDS:
-        if td >= datetime.timedelta(**{td_unit: 1}):
+    for unitary_timedelta, dt_unit in UNITARY_TIMEDELTAS:
+        if td >= unitary_timedelta:
             return dt_unit
 
 
@@ -61,10 +88,11 @@ def get_unitary_timedelta(td):
     So if a timedelta is 12 days return days=1. If a timedelta is 1 day, return
     days=1. If a timedelta is 45 minutes, return minutes=1.
     """
-    for td_unit, _ in TIME_DELTA_THRESHOLDS:
-        unitary_timedelta = datetime.timedelta(**{td_unit: 1})
-        if td >= unitary_timedelta:
-            return unitary_timedelta
+    return UNITARY_TIMEDELTA_BY_UNIT.get(get_timedelta_unit(td))
+
+
+def _floor_datetime_to_unit(dt, unit):
+    return dt.replace(**FLOOR_KWARGS_BY_UNIT[unit])
 
 
 def floor_datetime(dt, td):
@@ -75,33 +103,29 @@ def floor_datetime(dt, td):
     and smaller units to 0. If given a timedelta where the largest unit is
     minutes, set seconds and microseconds to 0.
     """
-    unit = get_timedelta_unit(td)
-    units = DATE_TIME_UNITS[DATE_TIME_UNITS.index(unit) + 1:]
-    return dt.replace(**{unit: 0 for unit in units})
+    return _floor_datetime_to_unit(dt, get_timedelta_unit(td))
 
 
 def ceil_datetime(dt, td):
     """Same as floor_datetime but round up if the smaller units are not 0."""
-    floored_datetime = floor_datetime(dt, td)
+    unit = get_timedelta_unit(td)
+    floored_datetime = _floor_datetime_to_unit(dt, unit)
     if floored_datetime == dt:
         return dt
-    return floored_datetime + get_unitary_timedelta(td)
+    return floored_datetime + UNITARY_TIMEDELTA_BY_UNIT[unit]
 
 
+@functools.lru_cache(maxsize=1024)
 def parse_interval_part(interval_part):
     """
     Given either half of an ISO-8601 interval, parse it.
 
     ISO-8601 intervals consist of either two ISO-8601 date/times or else one
-    ISO-8601 date/time and one ISO-8601 duration, so here we try to parse
-    durations, then datetimes, then dates.
+    ISO-8601 date/time and one ISO-8601 duration. Durations start with P and
+    datetimes contain a T, so we try the parser that the part looks like it
+    needs first and only fall back to the others if that fails.
     """
-    parsers = [
-        isodate.parse_duration,
-        isodate.parse_datetime,
-        isodate.parse_date
-    ]
-    for parser in parsers:
+    for parser in _guess_interval_part_parsers(interval_part):
         try:
             return parser(interval_part)
         except isodate.ISO8601Error:
@@ -109,6 +133,14 @@ def parse_interval_part(interval_part):
     return None
 
 
+def _guess_interval_part_parsers(interval_part):
+    if interval_part.lstrip('+-')[:1] == 'P':
+        return (_parse_duration, isodate.parse_datetime, isodate.parse_date)
+    if 'T' in interval_part:
+        return (isodate.parse_datetime, isodate.parse_date, _parse_duration)
+    return (isodate.parse_date, isodate.parse_datetime, _parse_duration)
+
+
 def parse_interval(interval):
     """
     Parse a full ISO-8601 interval.
@@ -122,11 +154,11 @@ def parse_interval(interval):
     right_value = parse_interval_part(right)
 
     # interval/date eg 'P7D/2010-01-01'
-    if type(left_value) == datetime.timedelta:
+    if isinstance(left_value, datetime.timedelta):
         duration, end = left_value, right_value
         start = end - duration
     # date/interval eg '2010-01-01/P7D'
-    elif type(right_value) == datetime.timedelta:
+    elif isinstance(right_value, datetime.timedelta):
         start, duration = left_value, right_value
         end = start + duration
     # date/date eg '2010-01-01/2010-01-08'
@@ -139,9 +171,9 @@ def parse_interval(interval):
 
 def interval_or_delta(duration):
     """Accept a timedelta or an ISO-8601 interval and return a timedelta."""
-    if isinstance(duration, basestring):
+    if isinstance(duration, str):
         return parse_interval(duration)[2]
-    elif type(duration) == datetime.timedelta:
+    elif isinstance(duration, datetime.timedelta):
         return duration
     raise ValueError(
         'Invalid duration value: {}. '
@@ -150,9 +182,9 @@ def interval_or_delta(duration):
 
 def duration_or_delta(duration):
     """Accept a timedelta or an ISO-8601 duration and return a timedelta."""
-    if isinstance(duration, basestring):
-        return isodate.parse_duration(duration)
-    elif type(duration) == datetime.timedelta:
+    if isinstance(duration, str):
+        return _parse_duration(duration)
+    elif isinstance(duration, datetime.timedelta):
         return duration
     raise ValueError(
         'Invalid duration value: {}. '
@@ -166,19 +198,24 @@ def divide_durations(d1, d2):
 
 def round_duration(duration, resolution):
     """Round a timedelta to the units specified by resolution."""
-    resolution_duration = duration_or_delta(resolution)
-    seconds = round(divide_durations(duration, resolution_duration)) * resolution_duration.total_seconds()
-    duration = datetime.timedelta(seconds=seconds)
-    return isodate.duration_isoformat(duration)
+    return round_durations([duration], resolution)[0]
+
+
+def round_durations(durations, resolution):
+    """Round each of several timedeltas to the units specified by resolution."""
+    resolution_seconds = duration_or_delta(resolution).total_seconds()
+    return [
+        timedelta_isoformat(datetime.timedelta(
+            seconds=round(duration.total_seconds() / resolution_seconds) * resolution_seconds))
+        for duration in durations
+    ]
 
 
 def find_closest_duration(duration, choices):
     """Find a duration in a list closest to a given duration."""
-    durations = [duration_or_delta(choice) for choice in choices]
-    ratios = [divide_durations(duration_choice, duration) for duration_choice in durations]
-    distances = [abs(ratio - 1) for ratio in ratios]
-    idx_min = sorted(enumerate(distances), key=lambda pair: pair[1])[0][0]
-    return choices[idx_min]
+    seconds = duration.total_seconds()
+    # The first of equally close choices wins.
+    return min(choices, key=lambda choice: abs(duration_or_delta(choice).total_seconds() / seconds - 1))
 
 
 def select_granularity(interval, n_buckets, resolution=None, choices=None):
@@ -1,8 +1,6 @@
 """Minimal error classes that contain the query and the response."""
-import sys
 
-if sys.version_info >= (3, 0):
-    basestring = str
+QUERY_ERROR_PREFIX = 'Invalid Druid query:\n  '
 
 
 class DruidError(Exception):
@@ -20,10 +18,10 @@ class DruidQueryError(DruidError):
 
     def __init__(self, errors, query=None, response=None):
         """Create a message for a variable number of Druid query errors."""
-        if isinstance(errors, basestring):
-            errors = [errors]
-        error = 'Invalid Druid query:\n  {}'.format(
-            errors[0] if len(errors) == 1 else '\n  '.join(errors))
+        if isinstance(errors, str):
+            error = QUERY_ERROR_PREFIX + errors
+        else:
+            error = QUERY_ERROR_PREFIX + '\n  '.join(errors)
         super(DruidQueryError, self).__init__(
             error, query=query, response=response)
 
@@ -41,5 +39,5 @@ class DruidTimeoutError(DruidExecutionError):
         """Create a message displaying the relevant data for timeouts."""
         error = 'Druid timeout error. Elapsed request time: {}; specified timeout: {}'.format(
             elapsed, timeout)
-        super(DruidExecutionError, self).__init__(
+        super(DruidTimeoutError, self).__init__(
             error, query=query, response=response)
@@ -5,13 +5,12 @@ Because all of these objects are dicts, they serialize to JSON like dicts.
 """
 import numbers
 import re
-import sys
 
 from . import caseconversion
 from . import typeddict
 
-if sys.version_info >= (3, 0):
-    basestring = str
+
+COMBINING_FILTER_TYPES = frozenset(('and', 'or'))
 
 
 class Filter(typeddict.TypedDict):
@@ -21,6 +20,8 @@ class Filter(typeddict.TypedDict):
     Provides instance methods for negating and combining filters.
     """
 
+    __slots__ = ()
+
     @caseconversion.camel_case_kwargs
     def __init__(self, type, **kwargs):
         """Require different keys on the filter depending on the type."""
@@ -32,30 +33,30 @@ class Filter(typeddict.TypedDict):
             'fields': list
         },
         'bound': {
-            'dimension': basestring
+            'dimension': str
         },
         'columnComparison': {
             'dimensions': list
         },
         'in': {
-            'dimension': basestring,
+            'dimension': str,
             'values': list
         },
         'interval': {
-            'dimension': basestring,
+            'dimension': str,
             'intervals': list
         },
         'javascript': {
-            'dimension': basestring,
-            'function': basestring
+            'dimension': str,
+            'function': str
         },
         'like': {
-            'dimension': basestring,
-            'pattern': basestring
+            'dimension': str,
+            'pattern': str
         },
         'extraction': {
-            'dimension': basestring,
-            'outputName': basestring,
+            'dimension': str,
+            'outputName': str,
             'extractionFn': dict
         },
         'not': {
@@ -65,15 +66,15 @@ class Filter(typeddict.TypedDict):
             'fields': list
         },
         'regex': {
-            'dimension': basestring,
-            'pattern': basestring
+            'dimension': str,
+            'pattern': str
         },
         'search': {
-            'dimension': basestring,
+            'dimension': str,
             'query': dict
         },
         'selector': {
-            'dimension': basestring,
+            'dimension': str,
             'value': None
         }
     }
@@ -81,14 +82,14 @@ class Filter(typeddict.TypedDict):
     optional_fields = {
         'bound': {
             'extractionFn': dict,
-            'ordering': basestring,
-            'lower': (basestring, numbers.Number),
+            'ordering': str,
+            'lower': (str, numbers.Number),
             'lowerStrict': bool,
-            'upper': (basestring, numbers.Number),
+            'upper': (str, numbers.Number),
             'upperStrict': bool
         },
         'like': {
-            'escape': basestring,
+            'escape': str,
             'extractionFn': dict
         },
         'selector': {
@@ -99,15 +100,37 @@ class Filter(typeddict.TypedDict):
     @staticmethod
     def negate_filter(filter_):
         """Negate a filter."""
-        return Filter('not', field=filter_)
+        if not isinstance(filter_, dict):
+            return Filter('not', field=filter_)
+        # A dict is all a not filter's field needs to be, so skip validating it again.
+        negated_filter = Filter.__new__(Filter)
+        negated_filter._init_validated('not', field=filter_)
+        return negated_filter
 
     @staticmethod
     def combine_filters(type_, *filters):
-        """Take a variable number of filters and join them."""
-        fields = [filter_ for filter_ in filters if filter_]
+        """
+        Take a variable number of filters and join them.
+
+        Filters which are themselves joined the same way are flattened, so
+        joining and(a, b) with c gives and(a, b, c) rather than and(and(a, b), c).
+        """
+        fields = []
+        for filter_ in filters:
+            if not filter_:
+                continue
+            if filter_.get('type') == type_:
+                fields.extend(filter_['fields'])
+            else:
+                fields.append(filter_)
         if len(fields) == 1:
             return fields[0]
-        return Filter(type_, fields=fields)
+        if type_ not in COMBINING_FILTER_TYPES:
+            return Filter(type_, fields=fields)
+        # The fields are known to be a list, so skip validating the joined filter.
+        combined_filter = Filter.__new__(Filter)
+        combined_filter._init_validated(type_, fields=fields)
+        return combined_filter
 
     @staticmethod
     def join_filters(*filters):
@@ -123,6 +146,17 @@ class Filter(typeddict.TypedDict):
         """Negate a filter instance."""
         return Filter.negate_filter(self)
 
+    def _init_validated(self, type_, **fields):
+        """
+        Set the type and fields of a filter which have already been validated.
+
+        Convenience subclasses check their own arguments, so when they're given
+        nothing else they use this to skip the generic validation of the fields.
+        """
+        self.type = type_
+        self['type'] = type_
+        self.update(fields)
+
 
 class SelectorFilter(Filter):
     """
@@ -141,17 +175,22 @@ class SelectorFilter(Filter):
             Extraction function to apply to the dimension
     """
 
+    __slots__ = ()
+
     @caseconversion.camel_case_kwargs
     def __init__(self, dimension=None, value=None, **kwargs):
-        if not isinstance(dimension, basestring):
+        if not isinstance(dimension, str):
             raise ValueError("`dimension` is required to be a string")
         if isinstance(value, bool):
             value = {
                 False: 'f',
                 True: 't'
             }[value]
-        super(SelectorFilter, self).__init__(
-            type='selector', dimension=dimension, value=value, **kwargs)
+        if kwargs:
+            super(SelectorFilter, self).__init__(
+                type='selector', dimension=dimension, value=value, **kwargs)
+        else:
+            self._init_validated('selector', dimension=dimension, value=value)
 
     __init__.__doc__ = __doc__
 
@@ -167,12 +206,17 @@ class ColumnComparisonFilter(Filter):
             The (two) dimensions to compare.
     """
 
+    __slots__ = ()
+
     @caseconversion.camel_case_kwargs
     def __init__(self, dimensions=None, **kwargs):
         if not isinstance(dimensions, list) or len(dimensions) != 2:
             raise ValueError("`dimensions` is required to be a 2-length list")
-        super(ColumnComparisonFilter, self).__init__(
-            type='columnComparison', dimensions=dimensions, **kwargs)
+        if kwargs:
+            super(ColumnComparisonFilter, self).__init__(
+                type='columnComparison', dimensions=dimensions, **kwargs)
+        else:
+            self._init_validated('columnComparison', dimensions=dimensions)
 
     __init__.__doc__ = __doc__
 
@@ -190,14 +234,19 @@ class RegexFilter(Filter):
             The pattern to match.
     """
 
+    __slots__ = ()
+
     @caseconversion.camel_case_kwargs
     def __init__(self, dimension=None, pattern=None, **kwargs):
-        if not isinstance(dimension, basestring):
+        if not isinstance(dimension, str):
             raise ValueError("`dimension` is required to be a string")
-        if not isinstance(pattern, basestring):
+        if not isinstance(pattern, str):
             raise ValueError("`pattern` is required to be a string")
-        super(RegexFilter, self).__init__(
-            type='regex', dimension=dimension, pattern=pattern, **kwargs)
+        if kwargs:
+            super(RegexFilter, self).__init__(
+                type='regex', dimension=dimension, pattern=pattern, **kwargs)
+        else:
+            self._init_validated('regex', dimension=dimension, pattern=pattern)
 
     __init__.__doc__ = __doc__
 
@@ -213,12 +262,17 @@ class AndFilter(Filter):
             The fields to and-join
     """
 
+    __slots__ = ()
+
     @caseconversion.camel_case_kwargs
     def __init__(self, fields=None, **kwargs):
         if not isinstance(fields, list):
             raise ValueError("`fields` is required to be a list")
-        super(AndFilter, self).__init__(
-            type='and', fields=fields, **kwargs)
+        if kwargs:
+            super(AndFilter, self).__init__(
+                type='and', fields=fields, **kwargs)
+        else:
+            self._init_validated('and', fields=fields)
 
     __init__.__doc__ = __doc__
 
@@ -234,12 +288,17 @@ class OrFilter(Filter):
             The fields to or-join
     """
 
+    __slots__ = ()
+
     @caseconversion.camel_case_kwargs
     def __init__(self, fields=None, **kwargs):
         if not isinstance(fields, list):
             raise ValueError("`fields` is required to be a list")
-        super(OrFilter, self).__init__(
-            type='or', fields=fields, **kwargs)
+        if kwargs:
+            super(OrFilter, self).__init__(
+                type='or', fields=fields, **kwargs)
+        else:
+            self._init_validated('or', fields=fields)
 
     __init__.__doc__ = __doc__
 
@@ -255,12 +314,17 @@ class NotFilter(Filter):
             The field to negate
     """
 
+    __slots__ = ()
+
     @caseconversion.camel_case_kwargs
     def __init__(self, field=None, **kwargs):
         if not isinstance(field, dict):
             raise ValueError("`field` is required to be a dict or Filter")
-        super(NotFilter, self).__init__(
-            type='not', field=field, **kwargs)
+        if kwargs:
+            super(NotFilter, self).__init__(
+                type='not', field=field, **kwargs)
+        else:
+            self._init_validated('not', field=field)
 
     __init__.__doc__ = __doc__
 
@@ -279,14 +343,19 @@ class InFilter(Filter):
             See http://druid.io/docs/latest/querying/filters.html#filtering-with-extraction-functions.
     """
 
+    __slots__ = ()
+
     @caseconversion.camel_case_kwargs
     def __init__(self, dimension=None, values=None, **kwargs):
-        if not isinstance(dimension, basestring):
+        if not isinstance(dimension, str):
             raise ValueError("`dimension` is required to be a string")
         if values is None:
             raise ValueError("`values` cannot be None")
-        super(InFilter, self).__init__(
-            type='in', dimension=dimension, values=values, **kwargs)
+        if kwargs or not isinstance(values, list):
+            super(InFilter, self).__init__(
+                type='in', dimension=dimension, values=values, **kwargs)
+        else:
+            self._init_validated('in', dimension=dimension, values=values)
 
     __init__.__doc__ = __doc__
 
@@ -304,14 +373,19 @@ class LikeFilter(Filter):
             The pattern to match.
     """
 
+    __slots__ = ()
+
     @caseconversion.camel_case_kwargs
     def __init__(self, dimension=None, pattern=None, **kwargs):
-        if not isinstance(dimension, basestring):
+        if not isinstance(dimension, str):
             raise ValueError("`dimension` is required to be a string")
-        if not isinstance(pattern, basestring):
+        if not isinstance(pattern, str):
             raise ValueError("`pattern` is required to be a string")
-        super(LikeFilter, self).__init__(
-            type='like', dimension=dimension, pattern=pattern, **kwargs)
+        if kwargs:
+            super(LikeFilter, self).__init__(
+                type='like', dimension=dimension, pattern=pattern, **kwargs)
+        else:
+            self._init_validated('like', dimension=dimension, pattern=pattern)
 
     __init__.__doc__ = __doc__
 
@@ -333,11 +407,13 @@ class ListFilter(Filter):
             The values to match
     """
 
+    __slots__ = ()
+
     @caseconversion.camel_case_kwargs
     def __init__(self, dimension=None, output_name=None, values=None, **kwargs):
-        if not isinstance(dimension, basestring):
+        if not isinstance(dimension, str):
             raise ValueError("`dimension` is required to be a string")
-        if not isinstance(output_name, basestring):
+        if not isinstance(output_name, str):
             raise ValueError("`output_name` is required to be a string")
         if not isinstance(values, list):
             raise ValueError("`values` is required to be a list")
@@ -381,12 +457,17 @@ class BoundFilter(Filter):
             Extraction function to apply to the dimension
     """
 
+    __slots__ = ()
+
     @caseconversion.camel_case_kwargs
     def __init__(self, dimension=None, pattern=None, **kwargs):
-        if not isinstance(dimension, basestring):
+        if not isinstance(dimension, str):
             raise ValueError("`dimension` is required to be a string")
-        super(BoundFilter, self).__init__(
-            type='bound', dimension=dimension, **kwargs)
+        if kwargs:
+            super(BoundFilter, self).__init__(
+                type='bound', dimension=dimension, **kwargs)
+        else:
+            self._init_validated('bound', dimension=dimension)
 
     __init__.__doc__ = __doc__
 
@@ -407,13 +488,18 @@ class IntervalFilter(Filter):
             Extraction function to apply to the dimension
     """
 
+    __slots__ = ()
+
     @caseconversion.camel_case_kwargs
     def __init__(self, dimension=None, intervals=None, **kwargs):
-        if not isinstance(dimension, basestring):
+        if not isinstance(dimension, str):
             raise ValueError("`dimension` is required to be a string")
         if not isinstance(intervals, list):
             raise ValueError("`intervals` is required to be a list")
-        super(IntervalFilter, self).__init__(
-            type='interval', dimension=dimension, intervals=intervals, **kwargs)
+        if kwargs:
+            super(IntervalFilter, self).__init__(
+                type='interval', dimension=dimension, intervals=intervals, **kwargs)
+        else:
+            self._init_validated('interval', dimension=dimension, intervals=intervals)
 
     __init__.__doc__ = __doc__
@@ -5,19 +5,15 @@ See http://druid.io/docs/latest/querying/granularities.html#period-granularities
 """
 
 import datetime
+import functools
 import isodate
-import math
 import pytz
-import sys
 
 from . import durations
 from . import caseconversion
 
-if sys.version_info >= (3, 0):
-    basestring = str
 
-
-SIMPLE_GRANULARITIES = (
+SIMPLE_GRANULARITIES = frozenset((
     'all',
     'day',
     'fifteen_minute',
@@ -28,9 +24,10 @@ SIMPLE_GRANULARITIES = (
     'thirty_minute',
     'week',
     'year'
-)
+))
 
 
+# Built once at import; lookups return these shared (immutable) timedeltas.
 SIMPLE_GRANULARITIES_TIMEDELTAS = {
     'all': None,
     'day': datetime.timedelta(days=1),
@@ -46,12 +43,22 @@ SIMPLE_GRANULARITIES_TIMEDELTAS = {
 }
 
 
+# Granularities are built over and over from a few distinct origins and time
+# zones, so remember the ones which have been validated.
+_parse_origin = functools.lru_cache(maxsize=256)(isodate.parse_datetime)
+
+_get_timezone = functools.lru_cache(maxsize=256)(pytz.timezone)
+
+
 class SimpleGranularity(str):
     """SimpleGranularity subclasses str to add validation but not complicate JSON encoding."""
 
+    __slots__ = ()
+
     def __new__(cls, granularity):
         """Validate that the granularity is an allowed value and create a string."""
-        if granularity not in SIMPLE_GRANULARITIES:
+        # Check the type first, since unhashable values can't be looked up in the set.
+        if not isinstance(granularity, str) or granularity not in SIMPLE_GRANULARITIES:
             raise ValueError('Invalid granularity: {}'.format(granularity))
         return str.__new__(cls, granularity)
 
@@ -62,12 +69,14 @@ class SimpleGranularity(str):
 
     def to_timedelta(self):
         """Return the timedelta between subsequent buckets."""
-        return SimpleGranularity.granularity_to_timedelta(self)
+        return SIMPLE_GRANULARITIES_TIMEDELTAS[self]
 
 
 class Granularity(dict):
     """Abstract base class with a validation method."""
 
+    __slots__ = ()
+
     def __init__(self):
         """Unimplemented."""
         raise NotImplementedError(
@@ -78,7 +87,7 @@ class Granularity(dict):
     def validate_origin(origin):
         """Validate that the origin string is an ISO-8601 datetime."""
         try:
-            isodate.parse_datetime(origin)
+            _parse_origin(origin)
         except isodate.ISO8601Error:
             raise ValueError('Invalid origin: {}'.format(origin))
 
@@ -90,6 +99,8 @@ class DurationGranularity(Granularity):
     See http://druid.io/docs/latest/querying/granularities.html#duration-granularities
     """
 
+    __slots__ = ()
+
     @caseconversion.camel_case_kwargs
     def __init__(self, **kwargs):
         """Create a duration from a number of miliseconds."""
@@ -103,9 +114,8 @@ class DurationGranularity(Granularity):
     @staticmethod
     def duration_to_timedelta(duration):
         """Return the timedelta between subsequent buckets."""
-        return datetime.timedelta(
-            seconds=math.floor(duration / 1000),
-            microseconds=(duration % 1000) * 1000)
+        seconds, milliseconds = divmod(duration, 1000)
+        return datetime.timedelta(seconds=seconds, microseconds=milliseconds * 1000)
 
     def to_timedelta(self):
         """Return the timedelta between subsequent buckets."""
@@ -119,16 +129,18 @@ class PeriodGranularity(Granularity):
     See http://druid.io/docs/latest/querying/granularities.html#period-granularities
     """
 
+    __slots__ = ()
+
     @staticmethod
     def period_to_timedelta(period):
         """Return the timedelta between subsequent buckets."""
-        return isodate.parse_duration(period)
+        return durations.duration_or_delta(period)
 
     @staticmethod
     def validate_period(period):
         """Validate that the period string is an ISO-8601 duration."""
         try:
-            isodate.parse_duration(period)
+            durations.validate_duration(period)
         except isodate.ISO8601Error:
             raise ValueError('Invalid period: {}'.format(period))
 
@@ -136,7 +148,7 @@ class PeriodGranularity(Granularity):
     def validate_timezone(timezone):
         """Validate that the timeZone string is an IANA timezone."""
         try:
-            pytz.timezone(timezone)
+            _get_timezone(timezone)
         except pytz.UnknownTimeZoneError:
             raise ValueError('Invalid timeZone: {}'.format(timezone))
 
@@ -176,15 +188,19 @@ class PeriodGranularity(Granularity):
         return PeriodGranularity.period_to_timedelta(self['period'])
 
 
+GRANULARITY_TO_TIMEDELTA_BY_TYPE = {
+    'period': lambda granularity: PeriodGranularity.period_to_timedelta(granularity['period']),
+    'duration': lambda granularity: DurationGranularity.duration_to_timedelta(granularity['duration'])
+}
+
+
 def granularity_to_timedelta(granularity):
     """Return the timedelta between subsequent buckets."""
-    if isinstance(granularity, basestring):
-        return SimpleGranularity.granularity_to_timedelta(granularity)
-    if isinstance(granularity, SimpleGranularity):
-        return granularity.to_timedelta(granularity)
+    # SimpleGranularity is a str, so this covers simple granularities either way.
+    if isinstance(granularity, str):
+        return SIMPLE_GRANULARITIES_TIMEDELTAS[granularity]
     if isinstance(granularity, dict):
-        if granularity['type'] == 'period':
-            return PeriodGranularity.period_to_timedelta(granularity['period'])
-        if granularity['type'] == 'duration':
-            return DurationGranularity.duration_to_timedelta(granularity['duration'])
+        to_timedelta = GRANULARITY_TO_TIMEDELTA_BY_TYPE.get(granularity['type'])
+        if to_timedelta is not None:
+            return to_timedelta(granularity)
     return None
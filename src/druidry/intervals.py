@@ -1,19 +1,34 @@
 """Creates ISO-8601 dates from a variety of inputs."""
 
 import datetime
-import isodate
-import sys
 
 from . import durations
 
-if sys.version_info >= (3, 0):
-    basestring = str
-
 
 def _datetime_now():
     return datetime.datetime.now()
 
 
+# How to turn each of the types accepted as part of an interval into a str.
+DATE_STR_CONVERTERS = {
+    str: str,
+    datetime.datetime: datetime.datetime.isoformat,
+    datetime.date: datetime.date.isoformat,
+    datetime.timedelta: durations.timedelta_isoformat
+}
+
+# Given which of start, end and duration are specified, how to get the two
+# parts of an interval from them. Any other combination needs an interval.
+TWO_PART_INTERVALS = {
+    (True, True, False): lambda start, end, duration: (start, end),
+    (True, True, True): lambda start, end, duration: (start, end),
+    (True, False, True): lambda start, end, duration: (start, duration),
+    (False, True, True): lambda start, end, duration: (duration, end),
+    (True, False, False): lambda start, end, duration: (start, _datetime_now()),
+    (False, False, True): lambda start, end, duration: (duration, _datetime_now())
+}
+
+
 class Interval(str):
     """Interval subclasses str to allow flexibility but not complicate JSON encoding."""
 
@@ -31,16 +46,19 @@ class Interval(str):
 
         # Now we have a duration, whether specified via kwargs or explicitly.
         # Check the remaining args to figure out how to proceed.
-        # If start or end is specified, we have three possibilities:
+        # If start or duration is specified, we have three possibilities:
         #    1. start/end
         #    2. start/duration
         #    3. duration/end
-        # All are handled in `_create_two_part_interval`. Otherwise, we just
-        # want to make sure that if duration or interval are passed as dates,
-        # we coerce them to ISO-8601 strings.
-        interval_str = None
-        if start or duration:
-            interval_str = cls._create_two_part_interval(cls, start, end, duration)
+        # with now as the end if none is given. All are looked up in
+        # TWO_PART_INTERVALS. Otherwise, we just want to make sure that if
+        # interval is passed as a date, we coerce it to an ISO-8601 string.
+        get_parts = TWO_PART_INTERVALS.get((bool(start), bool(end), bool(duration)))
+        if get_parts is not None:
+            # Parts given as strings, eg. from JSON, need no conversion.
+            interval_str = '/'.join([
+                part if type(part) is str else cls._create_date_str(part)
+                for part in get_parts(start, end, duration)])
         elif interval:
             interval_str = cls._create_date_str(interval)
         else:
@@ -52,30 +70,20 @@ class Interval(str):
 
         return str.__new__(cls, interval_str)
 
-    @staticmethod
-    def _create_two_part_interval(cls, start, end, duration):
-        if start and end:
-            parts = (cls._create_date_str(start), cls._create_date_str(end))
-        elif start and duration:
-            parts = (cls._create_date_str(start), cls._create_date_str(duration))
-        elif end and duration:
-            parts = (cls._create_date_str(duration), cls._create_date_str(end))
-        elif start:
-            parts = (cls._create_date_str(start), cls._create_date_str(_datetime_now()))
-        elif duration:
-            parts = (cls._create_date_str(duration), cls._create_date_str(_datetime_now()))
-
-        return '/'.join(parts)
-
     @staticmethod
     def _create_date_str(date_or_str):
         """Turn a datetime or timedelta into a date str."""
-        if isinstance(date_or_str, basestring):
+        to_str = DATE_STR_CONVERTERS.get(type(date_or_str))
+        if to_str is not None:
+            return to_str(date_or_str)
+
+        # Fall back to checking for subclasses, eg. Interval or pandas.Timestamp.
+        if isinstance(date_or_str, str):
             return date_or_str
-        if type(date_or_str) in (datetime.datetime, datetime.date):
+        if isinstance(date_or_str, datetime.date):
             return date_or_str.isoformat()
-        if type(date_or_str) == datetime.timedelta:
-            return isodate.duration_isoformat(date_or_str)
+        if isinstance(date_or_str, datetime.timedelta):
+            return durations.timedelta_isoformat(date_or_str)
 
         raise ValueError('Invalid value for interval: {}'.format(date_or_str))
 
@@ -87,11 +95,25 @@ class Interval(str):
         For example, if the timedelta's largest unit is hours, we floor the
         start to the nearest hour and ceil the end to the nearest hour.
         """
+        return Interval.pad_interval_by_timedeltas(interval, [td])
+
+    @staticmethod
+    def pad_interval_by_timedeltas(interval, tds):
+        """
+        Given an interval and several timedeltas, pad the interval by each in turn.
+
+        The interval is parsed once and formatted once, rather than once per timedelta.
+        """
         start, end, _ = durations.parse_interval(interval)
-        start_floor = durations.floor_datetime(start, td)
-        end_ceil = durations.ceil_datetime(end, td)
-        return Interval(start=start_floor, end=end_ceil)
+        for td in tds:
+            start = durations.floor_datetime(start, td)
+            end = durations.ceil_datetime(end, td)
+        return Interval(start=start, end=end)
 
     def pad_by_timedelta(self, td):
         """Given a timedelta, pad this interval by the timedelta."""
         return Interval.pad_interval_by_timedelta(self, td)
+
+    def pad_by_timedeltas(self, tds):
+        """Given several timedeltas, pad this interval by each in turn."""
+        return Interval.pad_interval_by_timedeltas(self, tds)
@@ -6,15 +6,16 @@ classes, because those are intended to be overriden later by query contexts.
 """
 
 import json
-import sys
 
 from . import errors
 from . import filters
 from . import caseconversion
 from . import typeddict
 
-if sys.version_info >= (3, 0):
-    basestring = str
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 VALID_QUERY_TYPES = (
@@ -26,10 +27,62 @@ VALID_QUERY_TYPES = (
     'topN',
 )
 
+VALID_QUERY_TYPE_SET = frozenset(VALID_QUERY_TYPES)
+
+VALID_QUERY_TYPES_DESCRIPTION = ', '.join(VALID_QUERY_TYPES)
+
+
+def _json_dumps(obj):
+    """Serialize to JSON, with orjson if it is installed."""
+    if orjson is None:
+        return json.dumps(obj)
+    return orjson.dumps(obj)
+
+
+JSON_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def _is_json_tree(obj):
+    """
+    Return whether obj is built only of types which json.dumps can serialize.
+
+    This is much cheaper than serializing obj just to find out. A False
+    result may still be serializable, so it is left to json.dumps to decide.
+    """
+    try:
+        return _is_json_node(obj)
+    except RecursionError:
+        return False
+
+
+def _is_json_node(obj):
+    if isinstance(obj, JSON_SCALAR_TYPES):
+        return True
+    if isinstance(obj, dict):
+        return all(
+            isinstance(key, str) and _is_json_node(value)
+            for key, value in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return all(_is_json_node(value) for value in obj)
+    return False
+
+
+ARGUMENT_TYPE_ERRORS = {
+    'aggregations': '`aggregations` is required to be a list',
+    'dimension': '`dimension` is required to be a string',
+    'dimensions': '`dimensions` is required to be a list',
+    'granularity': '`granularity` is required to be a string',
+    'intervals': '`intervals` must be a string or a list of strings',
+    'metric': '`metric` must be a string',
+    'threshold': '`threshold` must be an int',
+}
+
 
 class Query(typeddict.TypedDict):
     """Wrapper for a query object."""
 
+    __slots__ = ()
+
     @caseconversion.camel_case_kwargs
     def __init__(self, **kwargs):
         """Get the required properties, deferring validation of dataSource."""
@@ -44,30 +97,38 @@ class Query(typeddict.TypedDict):
     def _get_lookup_type(self):
         return self['queryType']
 
+    def __init_subclass__(cls, **kwargs):
+        """Compile the field specs of a subclass's query type when it is defined."""
+        super(Query, cls).__init_subclass__(**kwargs)
+        if cls.query_type is not None:
+            cls._get_field_specs(cls.query_type)
+
+    query_type = None
+
     required_fields = {
         'dataSourceMetadata': {},
         'timeseries': {
-            'granularity': [basestring, dict],
+            'granularity': (str, dict),
             'aggregations': list,
-            'intervals': [list, basestring]
+            'intervals': (list, str)
         },
         'groupBy': {
             'dimensions': list,
-            'granularity': [basestring, dict],
+            'granularity': (str, dict),
             'aggregations': list,
-            'intervals': [list, basestring]
+            'intervals': (list, str)
         },
         'scan': {
-            'intervals': [list, basestring]
+            'intervals': (list, str)
         },
         'segmentMetadata': {},
         'timeBoundary': {},
         'topN': {
             'aggregations': list,
-            'dimension': basestring,
-            'granularity': [basestring, dict],
-            'metric': basestring,
-            'intervals': [list, basestring],
+            'dimension': str,
+            'granularity': (str, dict),
+            'metric': str,
+            'intervals': (list, str),
             'threshold': int
         }
     }
@@ -92,18 +153,18 @@ class Query(typeddict.TypedDict):
         'scan': {
             'batchSize': int,
             'limit': int,
-            'resultFormat': basestring,
+            'resultFormat': str,
             'columns': list
         },
         'segmentMetadata': {
             'analysisTypes': list,
-            'intervals': [list, basestring],
+            'intervals': (list, str),
             'lenientAggregatorMerge': bool,
             'merge': bool,
             'toInclude': list,
         },
         'timeBoundary': {
-            'bound': basestring
+            'bound': str
         }
     }
 
@@ -114,27 +175,31 @@ class Query(typeddict.TypedDict):
 
         It must exist and be a string.
         """
-        if not isinstance(query.get('dataSource'), basestring) and not Query.get_subquery(query):
+        if not isinstance(query.get('dataSource'), str) and not Query.get_subquery(query):
             return 'Invalid dataSource: {}'.format(query.get('dataSource'))
 
     @staticmethod
     def validate_query_json(query):
         """Validate that the query is JSON serializable."""
+        if _is_json_tree(query):
+            return None
         try:
-            json.dumps(query)
+            _json_dumps(query)
+        # orjson.JSONEncodeError is a TypeError too.
         except TypeError as e:
-            return 'Druid queries must be JSON serializable. {e.message}'.format(e=e)
+            return 'Druid queries must be JSON serializable. {e}'.format(e=e)
 
     @staticmethod
     def validate_query_type(query):
         """Validate that the queryType is one of the valid types."""
-        if query.get('queryType') not in VALID_QUERY_TYPES:
+        query_type = query.get('queryType')
+        if not isinstance(query_type, str) or query_type not in VALID_QUERY_TYPE_SET:
             return (
                 'Invalid queryType "{query_type}". '
                 'Valid query types: {query_types}'
             ).format(
-                query_type=query.get('queryType'),
-                query_types=', '.join(VALID_QUERY_TYPES))
+                query_type=query_type,
+                query_types=VALID_QUERY_TYPES_DESCRIPTION)
 
     @staticmethod
     def validate_query(query):
@@ -145,20 +210,45 @@ class Query(typeddict.TypedDict):
             Query.validate_query_type
         ]
 
-        query_errors = [validator(query) for validator in validators if validator(query)]
+        query_errors = [error for error in (validator(query) for validator in validators) if error]
         if query_errors:
             raise errors.DruidQueryError(query_errors, query=query)
 
+    def copy(self):
+        """
+        Return a shallow copy, sharing any nested values with this one except its context.
+
+        Query contexts commonly add to the context, so the copy gets its own.
+        """
+        query = super(Query, self).copy()
+        query._copy_context()
+        return query
+
+    def _copy_context(self):
+        if isinstance(self.get('context'), dict):
+            self['context'] = dict(self['context'])
+
     @caseconversion.camel_case_kwargs
     def extend(self, **kwargs):
         """Return a new query with new or overriden keys as specified."""
-        return Query(**dict(self, **kwargs))
+        if not isinstance(self, Query) or 'queryType' in kwargs:
+            query = Query(**dict(self, **kwargs))
+        else:
+            # This query is already valid, so only the new keys need validating.
+            query = self._extend_validated(kwargs, Query)
+            if 'context' in kwargs:
+                query['context'] = kwargs['context']
+            if 'dataSource' in kwargs:
+                query['dataSource'] = kwargs['dataSource']
+        if 'context' not in kwargs:
+            query._copy_context()
+        return query
 
     @staticmethod
     def get_subquery(query):
         """Return the subquery if there is one."""
         data_source = query.get('dataSource')
-        if type(data_source) == dict and data_source.get('query'):
+        if isinstance(data_source, dict) and data_source.get('query'):
             return data_source['query']
 
     def validate(self):
@@ -175,9 +265,13 @@ class DataSourceMetadataQuery(Query):
     No required or optional arguments.
     """
 
+    __slots__ = ()
+
+    query_type = 'dataSourceMetadata'
+
     @caseconversion.camel_case_kwargs
     def __init__(self, **kwargs):  # NOQA
-        super(DataSourceMetadataQuery, self).__init__(query_type='dataSourceMetadata', **kwargs)
+        super(DataSourceMetadataQuery, self).__init__(query_type=self.query_type, **kwargs)
 
 
 class SegmentMetadataQuery(Query):
@@ -196,15 +290,23 @@ class SegmentMetadataQuery(Query):
         toInclude: list
     """
 
+    __slots__ = ()
+
+    query_type = 'segmentMetadata'
+
     @caseconversion.camel_case_kwargs
     def __init__(self, **kwargs):  # NOQA
-        super(SegmentMetadataQuery, self).__init__(query_type='segmentMetadata', **kwargs)
+        super(SegmentMetadataQuery, self).__init__(query_type=self.query_type, **kwargs)
 
 
 class DataQuery(Query):
 
+    __slots__ = ()
+
+    field_type_errors = ARGUMENT_TYPE_ERRORS
+
     def filter(self, filter_):
-        existing = self.pop('filter', None)
+        existing = self.get('filter')
         if existing is not None:
             new_filter = filters.Filter.join_filters(existing, filter_)
         else:
@@ -213,12 +315,18 @@ class DataQuery(Query):
 
     @classmethod
     def filter_query(cls, query, filter_):
-        new_query = query.copy()
-        existing = new_query.pop('filter', None)
+        existing = query.get('filter')
         if existing is not None:
             new_filter = filters.Filter.join_filters(existing, filter_)
         else:
             new_filter = filter_
+        if isinstance(query, Query) and query['queryType'] == cls.query_type:
+            # The query is already valid, so only the new filter needs validating.
+            new_query = query._extend_validated({'filter': new_filter}, cls)
+            new_query._copy_context()
+            return new_query
+        new_query = query.copy()
+        new_query.pop('filter', None)
         return cls(filter=new_filter, **new_query)
 
 
@@ -250,16 +358,14 @@ class TimeseriesQuery(DataQuery):
             See http://druid.io/docs/latest/querying/post-aggregations.html
     """
 
+    __slots__ = ()
+
+    query_type = 'timeseries'
+
     @caseconversion.camel_case_kwargs
     def __init__(self, aggregations=None, granularity=None, intervals=None, **kwargs):
-        if not isinstance(aggregations, list):
-            raise ValueError("`aggregations` is required to be a list")
-        if not isinstance(granularity, basestring) and not isinstance(granularity, dict):
-            raise ValueError("`granularity` is required to be a string")
-        if not isinstance(intervals, basestring) and not isinstance(intervals, list):
-            raise ValueError("`intervals` must be a string or a list of strings")
         super(TimeseriesQuery, self).__init__(
-            query_type='timeseries', aggregations=aggregations,
+            query_type=self.query_type, aggregations=aggregations,
             granularity=granularity, intervals=intervals, **kwargs)
 
     __init__.__doc__ = __doc__
@@ -301,18 +407,14 @@ class GroupByQuery(DataQuery):
             See http://druid.io/docs/latest/querying/post-aggregations.html
     """
 
+    __slots__ = ()
+
+    query_type = 'groupBy'
+
     @caseconversion.camel_case_kwargs
     def __init__(self, aggregations=None, dimensions=None, granularity=None, intervals=None, **kwargs):
-        if not isinstance(aggregations, list):
-            raise ValueError("`aggregations` is required to be a list")
-        if not isinstance(dimensions, list):
-            raise ValueError("`dimensions` is required to be a list")
-        if not isinstance(granularity, basestring) and not isinstance(granularity, dict):
-            raise ValueError("`granularity` is required to be a string")
-        if not isinstance(intervals, basestring) and not isinstance(intervals, list):
-            raise ValueError("`intervals` must be a string or a list of strings")
         super(GroupByQuery, self).__init__(
-            query_type='groupBy', aggregations=aggregations, dimensions=dimensions,
+            query_type=self.query_type, aggregations=aggregations, dimensions=dimensions,
             granularity=granularity, intervals=intervals, **kwargs)
 
     __init__.__doc__ = __doc__
@@ -338,13 +440,17 @@ class ScanQuery(Query):
             See http://druid.io/docs/latest/querying/post-aggregations.html
     """
 
+    __slots__ = ()
+
+    query_type = 'scan'
+
+    field_type_errors = ARGUMENT_TYPE_ERRORS
+
     @caseconversion.camel_case_kwargs
     def __init__(
             self, intervals=None, **kwargs):
-        if not isinstance(intervals, basestring) and not isinstance(intervals, list):
-            raise ValueError("`intervals` must be a string or a list of strings")
         super(ScanQuery, self).__init__(
-            query_type='scan', intervals=intervals, **kwargs)
+            query_type=self.query_type, intervals=intervals, **kwargs)
 
 
 class TimeBoundaryQuery(Query):
@@ -360,9 +466,13 @@ class TimeBoundaryQuery(Query):
             Either 'maxTime' or 'minTime'.
     """
 
+    __slots__ = ()
+
+    query_type = 'timeBoundary'
+
     @caseconversion.camel_case_kwargs
     def __init__(self, **kwargs):  # NOQA
-        super(TimeBoundaryQuery, self).__init__(query_type='timeBoundary', **kwargs)
+        super(TimeBoundaryQuery, self).__init__(query_type=self.query_type, **kwargs)
 
 
 class TopNQuery(DataQuery):
@@ -398,24 +508,16 @@ class TopNQuery(DataQuery):
             See http://druid.io/docs/latest/querying/post-aggregations.html
     """
 
+    __slots__ = ()
+
+    query_type = 'topN'
+
     @caseconversion.camel_case_kwargs
     def __init__(
             self, aggregations=None, dimension=None, granularity=None,
             intervals=None, metric=None, threshold=None, **kwargs):
-        if not isinstance(aggregations, list):
-            raise ValueError("`aggregations` is required to be a list")
-        if not isinstance(dimension, basestring):
-            raise ValueError("`dimension` is required to be a string")
-        if not isinstance(granularity, basestring) and not isinstance(granularity, dict):
-            raise ValueError("`granularity` is required to be a string")
-        if not isinstance(intervals, basestring) and not isinstance(intervals, list):
-            raise ValueError("`intervals` must be a string or a list of strings")
-        if not isinstance(metric, basestring):
-            raise ValueError("`metric` must be a string")
-        if not isinstance(threshold, int):
-            raise ValueError("`threshold` must be an int")
         super(TopNQuery, self).__init__(
-            query_type='topN', aggregations=aggregations, dimension=dimension,
+            query_type=self.query_type, aggregations=aggregations, dimension=dimension,
             granularity=granularity, intervals=intervals, metric=metric,
             threshold=threshold, **kwargs)
 
@@ -1,5 +1,17 @@
 """Utilites for post-processing results into dataframes."""
-import pandas as pd
+import functools
+import importlib.util
+
+# pandas is slow to import, so it is imported when a result is first converted.
+pd = None
+
+
+def _import_pandas():
+    global pd
+    if pd is None:
+        import pandas
+        pd = pandas
+    return pd
 
 
 class QueryResult(object):
@@ -7,39 +19,42 @@ class QueryResult(object):
 
     def __init__(self, query, result):
         """Accept the query and result. Check for dependencies and validity."""
-        if pd is None:
+        if pd is None and importlib.util.find_spec('pandas') is None:
             raise Exception('QueryResult requires pandas.')
         if query['queryType'] == 'timeBoundary':
             raise ValueError('timeBoundary is not supported for QueryResult objects.')
         self.query = query
         self.result = result
+        self.query_type = query['queryType']
+        self._datetimes = {}
 
     def __iter__(self):
         """Facilitate using these results like a normal JSON-parsed result."""
         return iter(self.result)
 
-    @property
+    @functools.cached_property
     def index(self):
         """Inspect the query to find the index for the dataframe."""
-        if self.query['queryType'] == 'scan':
+        query_type = self.query_type
+        if query_type == 'scan':
             if not self.query.get('columns') or '__time' in self.query['columns']:
                 return ['__time']
             return []
-        if self.query['queryType'] in {'groupBy', 'topN', 'timeseries'}:
+        if query_type in {'groupBy', 'topN', 'timeseries'}:
             index_fields = [] if self.query['granularity'] == 'all' else ['timestamp']
-        if self.query['queryType'] == 'groupBy':
+        if query_type == 'groupBy':
             return index_fields + self.query['dimensions']
-        elif self.query['queryType'] == 'topN':
+        elif query_type == 'topN':
             return index_fields + [self.query['dimension']]
-        elif self.query['queryType'] == 'timeseries':
+        elif query_type == 'timeseries':
             return index_fields
 
-    @property
+    @functools.cached_property
     def record_key(self):
         """Inspect the query to find the expected key of the data."""
-        if self.query['queryType'] == 'groupBy':
+        if self.query_type == 'groupBy':
             return 'event'
-        elif self.query['queryType'] in ('timeseries', 'topN'):
+        elif self.query_type in ('timeseries', 'topN'):
             return 'result'
 
     @property
@@ -50,15 +65,17 @@ class QueryResult(object):
         Flat-map the topN, since there are N results per time bucket.
         Otherwise, same as iterating the object itself.
         """
-        if self.query['queryType'] == 'topN':
+        if self.query_type == 'topN':
             for row in self.result:
+                timestamp = row['timestamp']
                 for r in row['result']:
-                    yield {'timestamp': row['timestamp'], 'result': r}
-        elif self.query['queryType'] == 'scan':
+                    yield {'timestamp': timestamp, 'result': r}
+        elif self.query_type == 'scan':
             for batch in self.result:
+                columns = batch['columns']
                 for event in batch['events']:
                     yield (
-                        dict(zip(batch['columns'], event))
+                        dict(zip(columns, event))
                         if isinstance(event, list) else event
                     )
         else:
@@ -68,21 +85,58 @@ class QueryResult(object):
     @property
     def records(self):
         """Coerce the rows to records for pandas."""
-        return [self.row_to_record(row) for row in self.rows]
+        row_to_record = self.row_to_record
+        return [row_to_record(row) for row in self.rows]
+
+    def _to_datetime(self, timestamp):
+        # Rows in the same time bucket share a timestamp, so each is converted only once.
+        try:
+            return self._datetimes[timestamp]
+        except KeyError:
+            converted = self._datetimes[timestamp] = _import_pandas().to_datetime(timestamp)
+            return converted
 
     def row_to_record(self, row):
         """Coerce a single row to a pandas record."""
-        record = row if not self.record_key else row[self.record_key]
+        record_key = self.record_key
+        record = row if not record_key else row[record_key]
         if 'timestamp' in row:
             return dict(
-                timestamp=pd.to_datetime(row['timestamp']), **record)
+                timestamp=self._to_datetime(row['timestamp']), **record)
         if '__time' in record:
-            return dict(record, __time=pd.to_datetime(record['__time']))
+            return dict(record, __time=self._to_datetime(record['__time']))
         return record
 
+    def _timestamped_records(self):
+        """Iterate the timestamp and record of each row, without wrapping topN results in rows."""
+        if self.query_type == 'topN':
+            for row in self.result:
+                timestamp = row['timestamp']
+                for r in row['result']:
+                    yield timestamp, r
+        else:
+            record_key = self.record_key
+            for row in self.rows:
+                yield row.get('timestamp'), row[record_key]
+
     def to_dataframe(self):
         """Transform the result object into a dataframe."""
-        if not self.index:
-            return pd.DataFrame.from_records(self.records)
+        pd = _import_pandas()
+        # Timestamps are converted a column at a time, rather than a row at a time as records does.
+        if self.record_key:
+            timestamps = []
+            records = []
+            for timestamp, record in self._timestamped_records():
+                timestamps.append(timestamp)
+                records.append(record)
+            df = pd.DataFrame.from_records(records)
+            if timestamps and timestamps[0] is not None:
+                df.insert(0, 'timestamp', pd.to_datetime(timestamps, cache=True))
         else:
-            return pd.DataFrame.from_records(self.records, index=self.index)
+            df = pd.DataFrame.from_records(list(self.rows))
+            if '__time' in df:
+                df['__time'] = pd.to_datetime(df['__time'], cache=True)
+
+        if not self.index:
+            return df
+        return df.set_index(self.index)
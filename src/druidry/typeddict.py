@@ -1,20 +1,30 @@
 from . import errors
 
 import copy
+import functools
 
 
 class ExtendableDict(dict):
 
+    __slots__ = ()
+
     @classmethod
     def wrap(cls, obj):
         return obj if isinstance(obj, cls) else cls(**obj)
 
     def copy(self):
+        """Return a shallow copy, sharing any nested values with this one."""
+        copy_ = dict.__new__(type(self))
+        dict.update(copy_, self)
+        return copy_
+
+    def deep_copy(self):
+        """Return a copy which shares no nested values with this one."""
         return copy.deepcopy(self)
 
     def extend(self, **kwargs):
-        copy_ = copy.deepcopy(self)
-        copy_.update(**kwargs)
+        copy_ = self.copy()
+        dict.update(copy_, kwargs)
         return copy_
 
     def extend_by(self, other):
@@ -23,6 +33,8 @@ class ExtendableDict(dict):
 
 class TypedDict(ExtendableDict):
 
+    __slots__ = ('type',)
+
     def __init__(self, type_, **kwargs):
         self.type = type_
         lookup_type = self._get_lookup_type()
@@ -30,37 +42,82 @@ class TypedDict(ExtendableDict):
         if lookup_type not in self.required_fields:
             raise errors.DruidQueryError(self.type_error_message.format(type=lookup_type))
 
-        self._set_required_fields(**kwargs)
-        self._set_optional_fields(**kwargs)
+        required_specs, optional_specs = self._get_field_specs(lookup_type)
+        self._set_required_fields(required_specs, kwargs)
+        self._set_optional_fields(optional_specs, kwargs)
 
-    def _set_optional_fields(self, **kwargs):
-        lookup_type = self._get_lookup_type()
-        for field, field_type in self.optional_fields.get(lookup_type, {}).items():
-            if field in kwargs:
-                if field_type:
-                    field_types = field_type if type(field_type) == list else [field_type]
-                    if not any(isinstance(kwargs[field], field_type) for field_type in field_types):
-                        raise errors.DruidQueryError(
-                            ['Field {} has mismatched type (expecting {}, found {})'.format(
-                                field, field_type, type(kwargs[field]))])
+    def copy(self):
+        copy_ = super(TypedDict, self).copy()
+        copy_.type = self.type
+        return copy_
 
-                self[field] = kwargs[field]
+    def _extend_validated(self, kwargs, cls=None):
+        """
+        Return a copy, as an instance of cls if given, with the typed fields in kwargs set.
+
+        Only the fields in kwargs are validated, since this one already was.
+        """
+        copy_ = dict.__new__(cls or type(self))
+        dict.update(copy_, self)
+        copy_.type = self.type
+        required_specs, optional_specs = self._get_field_specs(self._get_lookup_type())
+        for field_specs in (required_specs, optional_specs):
+            for field, classinfo, field_type in field_specs:
+                if field in kwargs:
+                    value = kwargs[field]
+                    if classinfo is not None and not isinstance(value, classinfo):
+                        copy_._raise_field_type_error(field, value, field_type)
+                    copy_[field] = value
+        return copy_
 
-    def _set_required_fields(self, **kwargs):
-        lookup_type = self._get_lookup_type()
-        for field, field_type in self.required_fields[lookup_type].items():
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_field_specs(cls, lookup_type):
+        """
+        Compile the required and optional fields of a type for validation.
+
+        Each field is given as a tuple of its name, the class or classes to
+        check it against with isinstance (or None) and its declared type.
+        """
+        def get_classinfo(field_type):
+            if not field_type:
+                return None
+            # A list of alternative types is still accepted, though a tuple is passed to isinstance as is.
+            return tuple(field_type) if isinstance(field_type, list) else field_type
+
+        def compile_fields(fields):
+            return tuple((field, get_classinfo(field_type), field_type) for field, field_type in fields.items())
+        return (
+            compile_fields(cls.required_fields[lookup_type]),
+            compile_fields(cls.optional_fields.get(lookup_type, {})))
+
+    @classmethod
+    def _raise_field_type_error(cls, field, value, field_type):
+        # Fields are checked inline with isinstance, so this is only called once a check has failed.
+        if field in cls.field_type_errors:
+            raise ValueError(cls.field_type_errors[field])
+        raise errors.DruidQueryError(
+            ['Field {} has mismatched type (expecting {}, found {})'.format(
+                field, field_type, type(value))])
+
+    def _set_optional_fields(self, field_specs, kwargs):
+        for field, classinfo, field_type in field_specs:
+            if field in kwargs:
+                value = kwargs[field]
+                if classinfo is not None and not isinstance(value, classinfo):
+                    self._raise_field_type_error(field, value, field_type)
+                self[field] = value
+
+    def _set_required_fields(self, field_specs, kwargs):
+        for field, classinfo, field_type in field_specs:
             if field not in kwargs:
                 raise errors.DruidQueryError(
                     ['Missing field: {} required for type: {}'.format(field, self.type)])
 
-            if field_type:
-                field_types = field_type if type(field_type) == list else [field_type]
-                if not any(isinstance(kwargs[field], field_type) for field_type in field_types):
-                    raise errors.DruidQueryError(
-                        ['Field {} has mismatched type (expecting {}, found {})'.format(
-                            field, field_type, type(kwargs[field]))])
-
-            self[field] = kwargs[field]
+            value = kwargs[field]
+            if classinfo is not None and not isinstance(value, classinfo):
+                self._raise_field_type_error(field, value, field_type)
+            self[field] = value
 
     def _get_lookup_type(self):
         return self.type
@@ -69,4 +126,7 @@ class TypedDict(ExtendableDict):
 
     required_fields = {}
 
+    # Messages for fields whose mismatched types raise ValueError rather than DruidQueryError.
+    field_type_errors = {}
+
     type_error_message = ''
@@ -1,3 +1,9 @@
+try:
+    import aiohttp
+except ImportError:
+    pass
+else:
+    from .test_async_client import TestAsyncClient
 from .test_aggregations import TestAggregation, TestPostAggregation
 from .test_caseconversion import TestCaseConversion
 from .test_client import TestClient
@@ -105,6 +105,23 @@ class TestAggregation(unittest.TestCase):
             "type": "fieldAccess"
         })
 
+    def test_set_name(self):
+        aggregation = druidry.aggregations.Aggregation(
+            'longSum', field_name='user_count', name='users_sum')
+        filtered = aggregation.filter(druidry.filters.SelectorFilter(dimension='is_active', value='t'))
+        self.assertEqual(aggregation.set_name('total')['name'], 'total')
+        self.assertEqual(filtered.set_name('total')['aggregator']['name'], 'total')
+        self.assertEqual(aggregation['name'], 'users_sum')
+        self.assertEqual(filtered['aggregator']['name'], 'users_sum')
+
+    def test_set_aggregation_name_inplace(self):
+        aggregation = druidry.aggregations.Aggregation(
+            'longSum', field_name='user_count', name='users_sum')
+        filtered = aggregation.filter(druidry.filters.SelectorFilter(dimension='is_active', value='t'))
+        self.assertIs(druidry.aggregations.Aggregation.set_aggregation_name_inplace(filtered, 'total'), filtered)
+        self.assertEqual(filtered['aggregator']['name'], 'total')
+        self.assertEqual(aggregation['name'], 'users_sum')
+
 
 class TestPostAggregation(unittest.TestCase):
 
@@ -242,6 +259,12 @@ class TestPostAggregation(unittest.TestCase):
             "fn": "/"
         })
 
+    def test_to_postagg_constant_copies(self):
+        postagg = druidry.aggregations.to_postagg(5)
+        postagg['name'] = 'five'
+        self.assertEqual(druidry.aggregations.to_postagg(5), {'type': 'constant', 'value': 5, 'name': 'constant__5'})
+        self.assertIsInstance(druidry.aggregations.to_postagg(5), druidry.aggregations.PostAggregation)
+
     def test_agg_add(self):
         users_agg = druidry.aggregations.Aggregation(
             'longSum', field_name='user_count', name='users_sum')
@@ -282,6 +305,11 @@ class TestPostAggregation(unittest.TestCase):
             "type": "fieldAccess"
         })
 
+    def test_no_instance_dict(self):
+        post_aggregation = druidry.aggregations.RatePostAggregation(
+            numerator='clicks', denominator='views', name='click_rate')
+        self.assertFalse(hasattr(post_aggregation, '__dict__'))
+
 
 if __name__ == '__main__':
     unittest.main()
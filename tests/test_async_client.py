@@ -0,0 +1,61 @@
+"""AsyncClient tests."""
+
+from .context import druidry
+import asyncio
+import datetime
+import mock
+import unittest
+
+
+class TestAsyncClient(unittest.TestCase):
+
+    def test_execute_many(self):
+        client = druidry.async_client.AsyncClient('localhost', 9999, data_source='users', pool_size=2)
+        queries = [
+            druidry.queries.Query(query_type='timeBoundary', bound=bound)
+            for bound in ('maxTime', 'minTime', 'maxTime')
+        ]
+
+        async def issue_request_async(query):
+            return query
+
+        with mock.patch.object(client, 'issue_request_async', side_effect=issue_request_async):
+            results = asyncio.run(client.execute_many(queries))
+
+        self.assertEqual(results, [
+            {'queryType': 'timeBoundary', 'bound': bound, 'dataSource': 'users'}
+            for bound in ('maxTime', 'minTime', 'maxTime')
+        ])
+
+    def test_execute_many_invalid(self):
+        client = druidry.async_client.AsyncClient('localhost', 9999)
+        with self.assertRaises(druidry.errors.DruidQueryError):
+            asyncio.run(client.execute_many([druidry.queries.Query(query_type='timeBoundary')]))
+
+    def test_session_per_event_loop(self):
+        client = druidry.async_client.AsyncClient('localhost', 9999)
+
+        async def get_sessions():
+            sessions = client._get_async_session(), client._get_async_session()
+            await sessions[0].close()
+            return sessions
+
+        first, first_again = asyncio.run(get_sessions())
+        second, _ = asyncio.run(get_sessions())
+        self.assertIs(first, first_again)
+        self.assertIsNot(first, second)
+
+    def test_issue_request_async_elapsed(self):
+        client = druidry.async_client.AsyncClient('localhost', 9999)
+        response = mock.Mock(status=200, read=mock.AsyncMock(return_value=b'[]'))
+        session = mock.Mock()
+        session.post.return_value.__aenter__ = mock.AsyncMock(return_value=response)
+        session.post.return_value.__aexit__ = mock.AsyncMock(return_value=False)
+        query = druidry.queries.Query(query_type='timeBoundary', data_source='users')
+
+        with mock.patch.object(client, '_get_async_session', return_value=session), \
+                mock.patch.object(client, 'parse_response') as parse_response:
+            asyncio.run(client.issue_request_async(query))
+
+        elapsed = parse_response.call_args[0][3]
+        self.assertIsInstance(elapsed, datetime.timedelta)
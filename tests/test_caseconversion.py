@@ -1,3 +1,4 @@
+import mock
 import unittest
 from .context import druidry
 
@@ -15,3 +16,50 @@ class TestCaseConversion(unittest.TestCase):
 
         result_false = fn(camel_case=False)
         self.assertFalse(result_false)
+
+    def test_snake_to_camel(self):
+        self.assertEqual(druidry.caseconversion._snake_to_camel('field_name'), 'fieldName')
+        self.assertEqual(druidry.caseconversion._snake_to_camel('fn_aggregate'), 'fnAggregate')
+        self.assertEqual(druidry.caseconversion._snake_to_camel('fieldName'), 'fieldName')
+        self.assertEqual(druidry.caseconversion._snake_to_camel('type'), 'type')
+        self.assertIs(druidry.caseconversion._snake_to_camel('extraction_fn'), 'extractionFn')
+
+    def test_camel_case_kwargs_named_parameter(self):
+
+        @druidry.caseconversion.camel_case_kwargs
+        def fn(output_name=None, **kwargs):
+            return output_name, kwargs
+
+        self.assertEqual(fn(output_name='a', field_name='b'), ('a', {'fieldName': 'b'}))
+        self.assertEqual(fn.__name__, 'fn')
+        # Converted names are remembered, so later calls convert the same way.
+        self.assertEqual(fn(field_name='c', fieldName2='d'), (None, {'fieldName': 'c', 'fieldName2': 'd'}))
+
+    def test_camel_case_kwargs_bounded(self):
+
+        @druidry.caseconversion.camel_case_kwargs
+        def fn(**kwargs):
+            return kwargs
+
+        key_map, = [cell.cell_contents for cell in fn.__closure__ if isinstance(cell.cell_contents, dict)]
+        with mock.patch.object(druidry.caseconversion, 'KWARG_NAME_CACHE_SIZE', 2):
+            for i in range(5):
+                self.assertEqual(fn(**{'field_{}'.format(i): i}), {'field{}'.format(i): i})
+        self.assertEqual(len(key_map), 2)
+        self.assertEqual(
+            druidry.caseconversion._snake_to_camel.cache_info().maxsize,
+            druidry.caseconversion.KWARG_NAME_CACHE_SIZE)
+
+    def test_snake_to_camel_edge_cases(self):
+        self.assertEqual(druidry.caseconversion._snake_to_camel('fn_2x'), 'fn2x')
+        self.assertEqual(druidry.caseconversion._snake_to_camel('by__row'), 'byRow')
+        self.assertEqual(druidry.caseconversion._snake_to_camel('type_'), 'type')
+
+    def test_camel_case_kwargs_already_camel(self):
+
+        @druidry.caseconversion.camel_case_kwargs
+        def fn(**kwargs):
+            return kwargs
+
+        self.assertEqual(fn(queryType='scan', intervals='x'), {'queryType': 'scan', 'intervals': 'x'})
+        self.assertEqual(fn(queryType='scan', data_source='x'), {'queryType': 'scan', 'dataSource': 'x'})
@@ -17,6 +17,15 @@ class TestClient(unittest.TestCase):
         client = druidry.client.Client('localhost', 9999)
         self.assertEqual(client.broker_metadata_endpoint, 'http://localhost:9999/druid/v2/datasources')
 
+    def test_client_endpoints_reconfigured(self):
+        client = druidry.client.Client('localhost', 9999, data_source='users')
+        client.host = 'broker'
+        client.port = 8082
+        client.path = 'druid/v3'
+        self.assertEqual(client.endpoint, 'http://broker:8082/druid/v3')
+        self.assertEqual(client.broker_metadata_endpoint, 'http://broker:8082/druid/v3/datasources')
+        self.assertEqual(client.data_source_metadata_endpoint, 'http://broker:8082/druid/v3/datasources/users')
+
     def test_client_data_source_metadata_endpoint(self):
         client = druidry.client.Client('localhost', 9999, data_source='users')
         self.assertEqual(client.data_source_metadata_endpoint, 'http://localhost:9999/druid/v2/datasources/users')
@@ -25,3 +34,46 @@ class TestClient(unittest.TestCase):
         client = druidry.client.Client('localhost', 9999)
         with self.assertRaises(druidry.errors.DruidQueryError):
             client.fetch_schema()
+
+    def test_client_context_manager(self):
+        with druidry.client.Client('localhost', 9999) as client:
+            self.assertEqual(client.endpoint, 'http://localhost:9999/druid/v2')
+
+    def test_json_round_trip(self):
+        query = druidry.queries.Query(query_type='timeBoundary', data_source='users')
+        self.assertEqual(druidry.client._json_loads(druidry.client._json_dumps(query)), query)
+
+    def test_prepare_query(self):
+        client = druidry.client.Client('localhost', 9999, data_source='users', timeout=1000)
+        query = client.prepare_query(druidry.queries.Query(query_type='timeBoundary'))
+        self.assertEqual(query, {
+            'queryType': 'timeBoundary',
+            'dataSource': 'users',
+            'context': {
+                'timeout': 1000
+            }
+        })
+
+    def test_prepare_query_copies(self):
+        def set_priority(query):
+            query['context'] = {'priority': 1}
+            return query
+
+        client = druidry.client.Client('localhost', 9999)
+        query = druidry.queries.Query(query_type='timeBoundary', data_source='users')
+        with druidry.context.QueryContext('priority', set_priority):
+            prepared_query = client.prepare_query(query)
+        self.assertEqual(prepared_query['context'], {'priority': 1})
+        self.assertEqual(query, {'queryType': 'timeBoundary', 'dataSource': 'users'})
+
+    def test_prepare_query_copies_context(self):
+        def set_priority(query):
+            query['context']['priority'] = 1
+            return query
+
+        client = druidry.client.Client('localhost', 9999)
+        query = druidry.queries.Query(query_type='timeBoundary', data_source='users', context={'timeout': 1})
+        with druidry.context.QueryContext('priority', set_priority):
+            prepared_query = client.prepare_query(query)
+        self.assertEqual(prepared_query['context'], {'timeout': 1, 'priority': 1})
+        self.assertEqual(query['context'], {'timeout': 1})
@@ -108,3 +108,78 @@ class TestContext(unittest.TestCase):
         with druidry.context.pad_query_interval_context():
             processed_query = druidry.context.process_query(query)
             self.assertEqual(processed_query['intervals'], '2014-09-24T11:00:00/2014-09-27T17:00:00')
+
+    def test_shared_filter_pushup_context(self):
+        filter_ = druidry.filters.SelectorFilter(dimension='channel', value='en')
+        aggregation = druidry.aggregations.Aggregation('count', name='count')
+        query = druidry.queries.TimeseriesQuery(
+            granularity='all',
+            aggregations=[aggregation.filter(filter_, name='en_count'), aggregation.filter(filter_, name='en_count_2')],
+            intervals='2014-09-24/2014-09-27')
+
+        with druidry.context.shared_filter_pushup_context():
+            processed_query = druidry.context.process_query(query)
+            self.assertEqual(processed_query['filter'], filter_)
+            self.assertEqual(processed_query['aggregations'], query['aggregations'])
+
+    def test_shared_filter_pushup_context_disjoint(self):
+        filter_en = druidry.filters.SelectorFilter(dimension='channel', value='en')
+        filter_ar = druidry.filters.SelectorFilter(dimension='channel', value='ar')
+        filter_active = druidry.filters.SelectorFilter(dimension='is_active', value='t')
+        aggregation = druidry.aggregations.Aggregation('count', name='count')
+        query = druidry.queries.TimeseriesQuery(
+            granularity='all',
+            aggregations=[aggregation.filter(filter_en, name='en_count'), aggregation.filter(filter_ar, name='ar_count')],
+            intervals='2014-09-24/2014-09-27',
+            filter=filter_active)
+
+        with druidry.context.shared_filter_pushup_context():
+            processed_query = druidry.context.process_query(query)
+            self.assertEqual(processed_query['filter'], {
+                'type': 'and',
+                'fields': [filter_active, {'type': 'or', 'fields': [filter_en, filter_ar]}]
+            })
+
+    def test_shared_filter_pushup_context_unfiltered(self):
+        filter_ = druidry.filters.SelectorFilter(dimension='channel', value='en')
+        aggregation = druidry.aggregations.Aggregation('count', name='count')
+        query = druidry.queries.TimeseriesQuery(
+            granularity='all',
+            aggregations=[aggregation, aggregation.filter(filter_, name='en_count')],
+            intervals='2014-09-24/2014-09-27')
+
+        with druidry.context.shared_filter_pushup_context():
+            processed_query = druidry.context.process_query(query)
+            self.assertNotIn('filter', processed_query)
+
+    def test_process_query_order(self):
+        query = druidry.queries.Query(query_type='timeBoundary')
+        outer = druidry.context.QueryContext('outer', lambda query: query.extend(bound='outer'))
+        inner = druidry.context.QueryContext('inner', lambda query: query.extend(bound='inner'))
+        with outer, inner:
+            processed_query = druidry.context.process_query(query)
+            self.assertEqual(processed_query['bound'], 'outer')
+
+    def test_data_source_context_subquery(self):
+        subquery = druidry.queries.Query(query_type='timeBoundary')
+        query = druidry.queries.Query(
+            query_type='timeBoundary', data_source={'type': 'query', 'query': subquery})
+        with druidry.context.data_source_context('users'):
+            processed_query = druidry.context.process_query(query)
+            self.assertEqual(processed_query['dataSource']['query']['dataSource'], 'users')
+            self.assertNotIn('dataSource', subquery)
+
+    def test_query_processor_chain(self):
+        query = druidry.queries.Query(query_type='timeBoundary')
+        with druidry.context.data_source_context('users'):
+            chain = druidry.context.get_query_processor_chain()
+            self.assertIs(druidry.context.get_query_processor_chain(), chain)
+            with druidry.context.timeout_context(timeout=1000):
+                self.assertEqual(len(druidry.context.get_query_processor_chain()), 2)
+                self.assertIn('context', druidry.context.process_query(query))
+            self.assertEqual(len(druidry.context.get_query_processor_chain()), 1)
+            self.assertNotIn('context', druidry.context.process_query(query))
+
+    def test_process_query_no_contexts(self):
+        query = druidry.queries.Query(query_type='timeBoundary')
+        self.assertIs(druidry.context.process_query(query), query)
@@ -1,6 +1,7 @@
 from .context import druidry
 import datetime
 import numbers
+import timeit
 import unittest
 
 
@@ -27,6 +28,86 @@ class TestDimension(unittest.TestCase):
             dimension='page', value='Home')
         self.assertEqual(dimension.create_selector('Home'), expected_value)
 
+    def test_grouped_choices_fetched_once(self):
+        calls = []
+
+        def choices(intervals=None, filter_=None):
+            calls.append((intervals, filter_))
+            return {
+                'english': {'group': ['en', 'en-gb']},
+                'arabic': {'group': ['ar']}
+            }
+
+        dimension = druidry.data_source.GroupedCategoricalDimension(choices, dimension='channel')
+        or_filter, list_filter = druidry.data_source.DataSourceView().get_filter_for_dimension_choices(
+            dimension, 'channel', intervals='P1D/2018-01-01')
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(or_filter['fields'][0], druidry.filters.OrFilter([
+            druidry.filters.SelectorFilter(dimension='channel', value='en'),
+            druidry.filters.SelectorFilter(dimension='channel', value='en-gb')
+        ]))
+        self.assertEqual(list_filter['outputName'], 'channel')
+
+    def test_cache_choices(self):
+        calls = []
+
+        def choices(intervals=None, filter_=None):
+            calls.append((intervals, filter_))
+            return {'en': 'English', 'ar': 'Arabic'}
+
+        dimension = druidry.data_source.CategoricalDimension(
+            choices=choices, dimension='channel', cache_choices=True)
+        filter_ = druidry.filters.SelectorFilter(dimension='isRobot', value='f')
+        self.assertEqual(dimension.choices('P1D/2018-01-01', filter_), ['en', 'ar'])
+        self.assertEqual(dimension.choices('P1D/2018-01-01', filter_), ['en', 'ar'])
+        self.assertEqual(len(calls), 1)
+        dimension.choices('P2D/2018-01-01', filter_)
+        self.assertEqual(len(calls), 2)
+        dimension.invalidate_choices()
+        dimension.choices('P1D/2018-01-01', filter_)
+        self.assertEqual(len(calls), 3)
+
+        # Intervals which can't be serialized as a cache key are fetched each time.
+        interval = [datetime.datetime(2018, 1, 1), datetime.datetime(2018, 1, 2)]
+        self.assertEqual(dimension.choices(interval, filter_), ['en', 'ar'])
+        dimension.choices(interval, filter_)
+        self.assertEqual(len(calls), 5)
+
+    def test_choices_filter(self):
+        dimension = druidry.data_source.CategoricalDimension(choices=['en', 'ar'], dimension='channel')
+        expected_filter = druidry.filters.OrFilter([
+            druidry.filters.SelectorFilter(dimension='channel', value='en'),
+            druidry.filters.SelectorFilter(dimension='channel', value='ar')
+        ])
+        or_filter = dimension.choices_filter()
+        self.assertEqual(or_filter, expected_filter)
+        or_filter['fields'][0]['value'] = 'fr'
+        self.assertEqual(dimension.choices_filter(), expected_filter)
+        self.assertIsInstance(dimension.choices_filter()['fields'][0], druidry.filters.SelectorFilter)
+        or_filter, _ = druidry.data_source.DataSourceView().get_filter_for_dimension_choices(dimension, 'channel')
+        self.assertEqual(or_filter, expected_filter)
+
+    def test_format_filter_name(self):
+        dimension = druidry.data_source.Dimension(dimension='page', name_suffix='%')
+        self.assertEqual(dimension.format_filter_name('Home'), 'page___eq___Home%')
+        self.assertEqual(dimension.format_filter_name(('a', 'c'), operator='in'), "page___in___('a', 'c')%")
+
+    def test_range_selectors(self):
+        dimension = druidry.data_source.NumericDimension(dimension='delta', ranges=[('0', '10'), ('10', '100')])
+        selectors = dimension.range_selectors()
+        self.assertEqual(selectors[0], (
+            ('0', '10'),
+            ('delta___in___0,10', {
+                'type': 'bound', 'dimension': 'delta', 'lower': '0', 'upper': '10',
+                'lowerStrict': False, 'upperStrict': True, 'ordering': 'numeric'})))
+        self.assertEqual(dimension.range_selectors(), selectors)
+        self.assertIsNot(dimension.range_selectors(), selectors)
+        dimension.ranges = [('100', '1000')]
+        self.assertEqual([selector[0] for selector in dimension.range_selectors()], [('100', '1000')])
+        dimension.ranges.append(('1000', '10000'))
+        self.assertEqual(
+            [selector[0] for selector in dimension.range_selectors()], [('100', '1000'), ('1000', '10000')])
+
 
 class TestDataSource(unittest.TestCase):
 
@@ -102,6 +183,212 @@ class TestDataSource(unittest.TestCase):
 
         self.assertEqual(query, expected_value)
 
+    def test_get_query_exclude_other_splits(self):
+        class WikipediaDataSource(druidry.data_source.DataSourceView):
+            channel = druidry.data_source.CategoricalDimension(dimension='channel', choices=['en', 'ar'])
+
+            user_count = druidry.aggregations.Aggregation(
+                'longSum', field_name='count', name='user_count')
+
+            users = druidry.data_source.ComplexMetric(metric='users', aggregations=[user_count])
+
+        query = WikipediaDataSource().get_query(
+            metrics=['users'],
+            splits=['channel'],
+            exclude_other_splits=True,
+            filters={
+                "type": "==",
+                "left": {"type": "field", "field": "isRobot"},
+                "right": {"type": "value", "value": False}
+            },
+            intervals='P1D/2018-01-01')
+
+        self.assertIsInstance(query, druidry.queries.GroupByQuery)
+        self.assertEqual(query['filter'], {
+            "type": "and",
+            "fields": [
+                {"type": "selector", "dimension": "isRobot", "value": "f"},
+                {
+                    "type": "or",
+                    "fields": [
+                        {"type": "selector", "dimension": "channel", "value": "en"},
+                        {"type": "selector", "dimension": "channel", "value": "ar"}
+                    ]
+                }
+            ]
+        })
+        self.assertEqual(query['dimensions'][0]['outputName'], 'channel')
+
+    def test_get_query_many(self):
+        class WikipediaDataSource(druidry.data_source.DataSourceView):
+            channel = druidry.data_source.CategoricalDimension(dimension='channel', choices=['en', 'ar'])
+
+            user_count = druidry.aggregations.Aggregation(
+                'longSum', field_name='count', name='user_count')
+
+            edit_count = druidry.aggregations.Aggregation(
+                'longSum', field_name='edits', name='edit_count')
+
+            users = druidry.data_source.ComplexMetric(metric='users', aggregations=[user_count])
+
+            edits = druidry.data_source.ComplexMetric(metric='edits', aggregations=[edit_count])
+
+        data_source = WikipediaDataSource()
+        query_specs = [
+            {'metrics': ['users'], 'intervals': 'P1D/2018-01-01'},
+            {'metrics': ['users'], 'splits': ['channel'], 'intervals': 'P7D/2018-01-01'},
+            {'metrics': ['users', 'edits'], 'granularity': 'day', 'intervals': 'P7D/2018-01-01'},
+            {'metrics': None, 'intervals': 'P1D/2018-01-01'}
+        ]
+        queries = data_source.get_query_many(query_specs)
+        self.assertEqual(queries, [data_source.get_query(**query_spec) for query_spec in query_specs])
+        self.assertIsInstance(queries[1], druidry.queries.GroupByQuery)
+        self.assertIsNot(queries[0]['aggregations'], queries[1]['aggregations'])
+        self.assertEqual(queries[3]['aggregations'], [])
+
+    def test_dimensions(self):
+        class WikipediaDataSource(druidry.data_source.DataSourceView):
+            is_anonymous = druidry.data_source.CategoricalDimension(
+                dimension='isAnonymous', choices=['true', 'false'])
+
+            page = druidry.data_source.Dimension(dimension='page')
+
+        data_source = WikipediaDataSource()
+        self.assertEqual(WikipediaDataSource.dimensions(), [WikipediaDataSource.is_anonymous, WikipediaDataSource.page])
+        self.assertIs(data_source.get_dimension('is_anonymous'), WikipediaDataSource.is_anonymous)
+        self.assertIs(data_source.get_dimension('isAnonymous'), WikipediaDataSource.is_anonymous)
+
+    def test_inherited_dimensions(self):
+        class WikipediaDataSource(druidry.data_source.DataSourceView):
+            page = druidry.data_source.Dimension(dimension='page')
+
+        class WikipediaEditsDataSource(WikipediaDataSource):
+            user = druidry.data_source.Dimension(dimension='user')
+
+        self.assertEqual(WikipediaDataSource.dimensions(), [WikipediaDataSource.page])
+        self.assertEqual(
+            WikipediaEditsDataSource.dimensions(), [WikipediaDataSource.page, WikipediaEditsDataSource.user])
+        self.assertIs(WikipediaEditsDataSource().get_dimension('page'), WikipediaDataSource.page)
+
+    def test_get_aggregations(self):
+        class WikipediaDataSource(druidry.data_source.DataSourceView):
+            user_count = druidry.aggregations.Aggregation(
+                'longSum', field_name='count', name='user_count')
+
+            edit_count = druidry.aggregations.Aggregation(
+                'longSum', field_name='edits', name='edit_count')
+
+            added = druidry.aggregations.Aggregation(
+                'longSum', field_name='added', name='added')
+
+            edits_per_user = druidry.data_source.ComplexMetric(
+                metric='edits_per_user', aggregations=[user_count, edit_count],
+                post_aggregations=[edit_count.divide(user_count, name='edits_per_user')])
+
+            added_per_user = druidry.data_source.ComplexMetric(
+                metric='added_per_user', aggregations=[user_count, added],
+                post_aggregations=[added.divide(user_count, name='added_per_user')])
+
+        data_source = WikipediaDataSource()
+        metrics = ['edits_per_user', 'added_per_user']
+        self.assertEqual(
+            data_source.get_aggregations(metrics),
+            [WikipediaDataSource.added, WikipediaDataSource.edit_count, WikipediaDataSource.user_count])
+        self.assertEqual(
+            [postagg['name'] for postagg in data_source.get_post_aggregations(metrics)],
+            ['added_per_user', 'edits_per_user'])
+        # Merged aggregations are reused for the same metrics, but each caller gets its own list.
+        aggs = data_source.get_aggregations(metrics)
+        self.assertEqual(data_source.get_aggregations(metrics), aggs)
+        self.assertIsNot(data_source.get_aggregations(metrics), aggs)
+
+    def test_get_aggregations_after_change(self):
+        user_count = druidry.aggregations.Aggregation('longSum', field_name='count', name='user_count')
+        edit_count = druidry.aggregations.Aggregation('longSum', field_name='edits', name='edit_count')
+
+        class WikipediaDataSource(druidry.data_source.DataSourceView):
+            users = druidry.data_source.ComplexMetric(metric='users', aggregations=[user_count])
+
+        self.assertEqual(WikipediaDataSource().get_aggregations(['users']), [user_count])
+        WikipediaDataSource.users = druidry.data_source.ComplexMetric(metric='users', aggregations=[edit_count])
+        self.assertEqual(WikipediaDataSource().get_aggregations(['users']), [edit_count])
+        self.assertIsNotNone(druidry.data_source._merge_metric_aggregations.cache_info().maxsize)
+
+    def test_filter_results(self):
+        results = [
+            {'users': 1, 'users_rate': 0.5, 'edits': 2},
+            {'users': 3, 'users_rate': 0.25, 'edits': 4}
+        ]
+        data_source = druidry.data_source.DataSourceView()
+        self.assertEqual(data_source.filter_result(results[0], 'users'), {'users': 1, 'users_rate': 0.5})
+        self.assertEqual(data_source.filter_results(results, 'users'), [
+            {'users': 1, 'users_rate': 0.5},
+            {'users': 3, 'users_rate': 0.25}
+        ])
+
+    def test_filter_results_differing_keys(self):
+        results = [
+            {'users': 1, 'edits': 2},
+            {'users_rate': 0.25, 'edits': 4},
+            {'users_rate': 0.5, 'edits': 1}
+        ]
+        data_source = druidry.data_source.DataSourceView()
+        self.assertEqual(data_source.filter_results(results, 'users'), [
+            {'users': 1},
+            {'users_rate': 0.25},
+            {'users_rate': 0.5}
+        ])
+
+    def test_class_attributes(self):
+        class WikipediaDataSource(druidry.data_source.DataSourceView):
+            user_count = druidry.aggregations.Aggregation(
+                'longSum', field_name='count', name='user_count')
+
+            user_rate = user_count.divide(user_count, name='user_rate')
+
+            users = druidry.data_source.ComplexMetric(
+                metric='users', aggregations=[user_count])
+
+        self.assertEqual(WikipediaDataSource.metrics(), [WikipediaDataSource.users])
+        self.assertEqual(WikipediaDataSource.aggregations(), [WikipediaDataSource.user_count])
+        self.assertEqual(WikipediaDataSource.post_aggregations(), [WikipediaDataSource.user_rate])
+        self.assertIsNot(WikipediaDataSource.metrics(), WikipediaDataSource.metrics())
+        self.assertIs(WikipediaDataSource().get_metric('users'), WikipediaDataSource.users)
+        self.assertIsNone(WikipediaDataSource().get_metric('missing'))
+        self.assertIsNone(WikipediaDataSource().get_dimension('user_count'))
+        self.assertIsNone(WikipediaDataSource().get_dimension('missing'))
+
+    def test_class_attributes_changed(self):
+        class WikipediaDataSource(druidry.data_source.DataSourceView):
+            users = druidry.data_source.ComplexMetric(metric='users')
+
+        class EnglishWikipediaDataSource(WikipediaDataSource):
+            pass
+
+        self.assertEqual(EnglishWikipediaDataSource.metrics(), [WikipediaDataSource.users])
+        WikipediaDataSource.edits = druidry.data_source.ComplexMetric(metric='edits')
+        self.assertEqual(EnglishWikipediaDataSource().get_metric('edits'), WikipediaDataSource.edits)
+        del WikipediaDataSource.edits
+        self.assertIsNone(EnglishWikipediaDataSource().get_metric('edits'))
+
+    def test_get_aggregations_missing_metric(self):
+        class WikipediaDataSource(druidry.data_source.DataSourceView):
+            users = druidry.data_source.Metric('users')
+
+        with self.assertRaises(AttributeError):
+            WikipediaDataSource().get_aggregations(['users'])
+        with self.assertRaises(AttributeError):
+            WikipediaDataSource().get_aggregations(['missing'])
+        with self.assertRaises(AttributeError):
+            WikipediaDataSource().get_aggregations([['users']])
+
+    def test_split_exclusion_filter_missing_dimension(self):
+        class WikipediaDataSource(druidry.data_source.DataSourceView):
+            channel = druidry.data_source.CategoricalDimension(choices=['en'], dimension='channel')
+
+        with self.assertRaisesRegex(AttributeError, "no dimension 'missing'"):
+            WikipediaDataSource().get_split_exclusion_filter(['channel', 'missing'])
+
 
 class TestFilters(unittest.TestCase):
     maxDiff = None
@@ -157,6 +444,27 @@ class TestFilters(unittest.TestCase):
         }
         self.assertEqual(druidry.data_source.translate_filter(input_filter), expected_filter)
 
+    def test_equality_field_list_value_filter(self):
+        input_filter = {
+            "type": "==",
+            "left": {"type": "field", "field": "channel"},
+            "right": {"type": "value", "value": ["en"]}
+        }
+        expected_filter = {
+            "type": "selector",
+            "dimension": "channel",
+            "value": "en"
+        }
+        self.assertEqual(druidry.data_source.translate_filter(input_filter), expected_filter)
+        input_filter["right"]["value"] = []
+        self.assertIsNone(druidry.data_source.translate_filter(input_filter))
+        input_filter["right"]["value"] = ["en", "ar"]
+        self.assertEqual(druidry.data_source.translate_filter(input_filter), {
+            "type": "in",
+            "dimension": "channel",
+            "values": ["en", "ar"]
+        })
+
     def test_equality_value_field_filter(self):
         input_filter = {
             "type": "==",
@@ -357,24 +665,9 @@ class TestFilters(unittest.TestCase):
                     ]
                 },
                 {
-                    "type": "or",
-                    "fields": [
-                        {
-                            "type": "selector",
-                            "dimension": "category",
-                            "value": "cat1"
-                        },
-                        {
-                            "type": "selector",
-                            "dimension": "category",
-                            "value": "cat17"
-                        },
-                        {
-                            "type": "selector",
-                            "dimension": "category",
-                            "value": "cat42"
-                        }
-                    ]
+                    "type": "in",
+                    "dimension": "category",
+                    "values": ["cat1", "cat17", "cat42"]
                 },
                 {
                     "type": "regex",
@@ -445,24 +738,9 @@ class TestFilters(unittest.TestCase):
                                        ]
                                    },
                                    {
-                                       "type": "or",
-                                       "fields": [
-                                           {
-                                               "type": "selector",
-                                               "dimension": "category",
-                                               "value": "cat1"
-                                           },
-                                           {
-                                               "type": "selector",
-                                               "dimension": "category",
-                                               "value": "cat17"
-                                           },
-                                           {
-                                               "type": "selector",
-                                               "dimension": "category",
-                                               "value": "cat42"
-                                           }
-                                       ]
+                                       "type": "in",
+                                       "dimension": "category",
+                                       "values": ["cat1", "cat17", "cat42"]
                                    },
                                    {
                                        "type": "regex",
@@ -475,6 +753,128 @@ class TestFilters(unittest.TestCase):
 
         self.assertEqual(druidry.data_source.translate_filter(input_filter), expected_value)
 
+    def test_nested_filters_are_flattened(self):
+        def selector(value):
+            return {
+                "type": "==",
+                "left": {"type": "field", "field": "channel"},
+                "right": {"type": "value", "value": value}
+            }
+
+        input_filter = {
+            "type": "and",
+            "filters": [
+                {"type": "and", "filters": [selector("en"), selector("ar")]},
+                selector("fr"),
+                {"type": "not", "filter": {"type": "not", "filter": selector("de")}}
+            ]
+        }
+        expected_filter = {
+            "type": "and",
+            "fields": [
+                {"type": "selector", "dimension": "channel", "value": value}
+                for value in ("en", "ar", "fr", "de")
+            ]
+        }
+        self.assertEqual(druidry.data_source.translate_filter(input_filter), expected_filter)
+
+    def test_single_filter_is_unwrapped(self):
+        input_filter = {
+            "type": "or",
+            "filters": [
+                {
+                    "type": "==",
+                    "left": {"type": "field", "field": "channel"},
+                    "right": {"type": "value", "value": "en"}
+                },
+                {
+                    "type": "in",
+                    "left": {"type": "field", "field": "channel"},
+                    "right": {"type": "value", "value": []}
+                }
+            ]
+        }
+        expected_filter = {"type": "selector", "dimension": "channel", "value": "en"}
+        self.assertEqual(druidry.data_source.translate_filter(input_filter), expected_filter)
+
+    def test_translate_filter_cached(self):
+        input_filter = {
+            "type": "==",
+            "left": {"type": "field", "field": "channel"},
+            "right": {"type": "value", "value": "en"}
+        }
+        translated_filter = druidry.data_source.translate_filter_cached(input_filter)
+        self.assertEqual(translated_filter, druidry.data_source.translate_filter(input_filter))
+        self.assertEqual(druidry.data_source.translate_filter_cached(dict(input_filter)), translated_filter)
+        self.assertIsNone(druidry.data_source.translate_filter_cached(None))
+
+        # Identical filters share one translation.
+        self.assertIs(druidry.data_source.translate_filter_cached(dict(input_filter)), translated_filter)
+
+        # Filters which can't be pickled are translated uncached.
+        unpicklable_filter = dict(input_filter, right={"type": "value", "value": "en", "extra": lambda: None})
+        self.assertEqual(druidry.data_source.translate_filter_cached(unpicklable_filter), translated_filter)
+
+    def test_translate_filter_cached_faster(self):
+        input_filter = {"type": "and", "filters": [
+            {
+                "type": "in",
+                "left": {"type": "field", "field": "dimension_{}".format(i)},
+                "right": {"type": "value", "value": ['a', 'b', 'c']}
+            }
+            for i in range(20)
+        ]}
+        druidry.data_source.translate_filter_cached(input_filter)
+        translate_time = min(timeit.repeat(
+            lambda: druidry.data_source.translate_filter(input_filter), number=100, repeat=5))
+        cached_time = min(timeit.repeat(
+            lambda: druidry.data_source.translate_filter_cached(input_filter), number=100, repeat=5))
+        self.assertLess(cached_time, translate_time)
+
+    def test_translate_filter_cached_tuple(self):
+        input_filter = {
+            "type": "==",
+            "left": {"type": "field", "field": "channel"},
+            "right": {"type": "value", "value": ['en', 'ar']}
+        }
+        tuple_filter = dict(input_filter, right={"type": "value", "value": ('en', 'ar')})
+        self.assertEqual(druidry.data_source.translate_filter_cached(input_filter)['type'], 'in')
+        self.assertEqual(
+            druidry.data_source.translate_filter_cached(tuple_filter),
+            druidry.data_source.translate_filter(tuple_filter))
+
+    def test_compile_filter(self):
+        input_filter = {
+            "type": "!=",
+            "left": {"type": "field", "field": "channel"},
+            "right": {"type": "value", "value": "en"}
+        }
+        compiled_filter = druidry.data_source.compile_filter(input_filter)
+        data_source = druidry.data_source.DataSourceView()
+        self.assertEqual(data_source.get_filters(compiled_filter), druidry.data_source.translate_filter(input_filter))
+        self.assertIs(data_source.get_filters(compiled_filter), compiled_filter())
+        self.assertIsInstance(compiled_filter(), druidry.filters.Filter)
+
+        # Compiling is cached, and get_filters uses the compiled filter.
+        self.assertIs(druidry.data_source.compile_filter(dict(input_filter)), compiled_filter)
+        self.assertIs(data_source.get_filters(input_filter), compiled_filter())
+        self.assertIsNone(data_source.get_filters(None))
+
+    def test_compile_filter_faster(self):
+        input_filter = {"type": "or", "filters": [
+            {
+                "type": "==",
+                "left": {"type": "field", "field": "dimension_{}".format(i)},
+                "right": {"type": "value", "value": i}
+            }
+            for i in range(20)
+        ]}
+        compiled_filter = druidry.data_source.compile_filter(input_filter)
+        translate_time = min(timeit.repeat(
+            lambda: druidry.data_source.translate_filter(input_filter), number=100, repeat=5))
+        compiled_time = min(timeit.repeat(compiled_filter, number=100, repeat=5))
+        self.assertLess(compiled_time, translate_time)
+
     def test_startswith_value_filter(self):
         input_filter = {
             "type": "startswith",
@@ -488,6 +888,10 @@ class TestFilters(unittest.TestCase):
         }
         self.assertEqual(druidry.data_source.translate_filter(input_filter), expected_filter)
 
+    def test_alternation_pattern(self):
+        self.assertEqual(druidry.data_source._alternation_pattern('^{}.*', ['Chrom', 'Fire']), '^Chrom.*|^Fire.*')
+        self.assertEqual(druidry.data_source._alternation_pattern('^{}.*', ['Chrom', ['Fire']]), "^Chrom.*|^['Fire'].*")
+
     def test_endwith_value_filter(self):
         input_filter = {
             "type": "endwith",
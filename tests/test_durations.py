@@ -9,6 +9,15 @@ class DurationTest(unittest.TestCase):
     def test_invalid_duration(self):
         with self.assertRaises(ValueError):
             druidry.durations.validate_duration('PT20Z')
+        # Failures aren't cached, so an invalid duration is rejected every time.
+        with self.assertRaises(ValueError):
+            druidry.durations.validate_duration('PT20Z')
+
+    def test_parse_interval_part(self):
+        self.assertEqual(druidry.durations.parse_interval_part('P1D'), datetime.timedelta(days=1))
+        self.assertEqual(druidry.durations.parse_interval_part('2010-01-08'), datetime.date(2010, 1, 8))
+        self.assertIsNone(druidry.durations.parse_interval_part('yesterday'))
+        self.assertIsNone(druidry.durations.parse_interval_part('yesterday'))
 
     def test_has_duration_kwarg(self):
         result = druidry.durations.has_duration_kwarg(foo='foo', bar='bar', years=2)
@@ -22,6 +31,10 @@ class DurationTest(unittest.TestCase):
         result = druidry.durations.duration_kwargs_to_isoformat(foo='foo', bar='bar', years=2)
         self.assertEqual(result, 'P2Y')
 
+    def test_duration_kwargs_to_isoformat_float(self):
+        self.assertEqual(druidry.durations.duration_kwargs_to_isoformat(years=2), 'P2Y')
+        self.assertEqual(druidry.durations.duration_kwargs_to_isoformat(years=2.0), 'P2.0Y')
+
     def test_floor_datetime_day_multiple(self):
         dt = datetime.datetime(year=2014, month=9, day=27, hour=16, minute=22, second=47)
         td = datetime.timedelta(days=12)
@@ -124,6 +137,13 @@ class DurationTest(unittest.TestCase):
         self.assertEqual(
             druidry.durations.get_timedelta_unit(datetime.timedelta(minutes=1)), 'minute')
 
+    def test_get_unitary_timedelta(self):
+        self.assertEqual(
+            druidry.durations.get_unitary_timedelta(datetime.timedelta(hours=30)), datetime.timedelta(days=1))
+        self.assertEqual(
+            druidry.durations.get_unitary_timedelta(datetime.timedelta(minutes=45)), datetime.timedelta(minutes=1))
+        self.assertIsNone(druidry.durations.get_unitary_timedelta(datetime.timedelta(milliseconds=10)))
+
     def test_parse_interval_duration_end(self):
         self.assertEqual(druidry.durations.parse_interval('P7DT12M/2010-01-08T12:41'), (
             datetime.datetime(year=2010, month=1, day=1, hour=12, minute=29),
@@ -197,3 +217,27 @@ class DurationTest(unittest.TestCase):
         self.assertEqual(
             druidry.durations.select_granularity(interval, 12, resolution='P1D'),
             'P2D')
+
+    def test_find_closest_duration_tie(self):
+        self.assertEqual(
+            druidry.durations.find_closest_duration(datetime.timedelta(hours=2), ['PT3H', 'PT1H', 'PT4H']),
+            'PT3H')
+
+    def test_duration_or_delta_timedelta_subclass(self):
+        class Delta(datetime.timedelta):
+            pass
+
+        delta = Delta(hours=6)
+        self.assertIs(druidry.durations.duration_or_delta(delta), delta)
+        self.assertIs(druidry.durations.interval_or_delta(delta), delta)
+
+    def test_round_durations(self):
+        self.assertEqual(
+            druidry.durations.round_durations(
+                [datetime.timedelta(minutes=50), datetime.timedelta(hours=2, minutes=20)], 'PT1H'),
+            ['PT1H', 'PT2H'])
+
+    def test_timedelta_isoformat(self):
+        self.assertEqual(druidry.durations.timedelta_isoformat(datetime.timedelta(days=7)), 'P7D')
+        self.assertEqual(druidry.durations.timedelta_isoformat(datetime.timedelta(hours=1, minutes=30)), 'PT1H30M')
+        self.assertEqual(druidry.durations.timedelta_isoformat(datetime.timedelta(days=7)), 'P7D')
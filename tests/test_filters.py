@@ -8,6 +8,27 @@ class FilterTest(unittest.TestCase):
         with self.assertRaises(druidry.errors.DruidQueryError):
             druidry.filters.Filter('INVALID')
 
+    def test_no_instance_dict(self):
+        filter_ = druidry.filters.AndFilter(fields=[druidry.filters.SelectorFilter(dimension='is_active', value='t')])
+        self.assertFalse(hasattr(filter_, '__dict__'))
+        self.assertFalse(hasattr(filter_['fields'][0], '__dict__'))
+
+    def test_convenience_filter_matches_generic_filter(self):
+        selector_filter = druidry.filters.SelectorFilter(dimension='is_active', value=True)
+        self.assertEqual(selector_filter, druidry.filters.Filter('selector', dimension='is_active', value='t'))
+        self.assertEqual(selector_filter.type, 'selector')
+        in_filter = druidry.filters.InFilter(dimension='browser', values=['Chrome', 'Firefox'])
+        self.assertEqual(in_filter, druidry.filters.Filter('in', dimension='browser', values=['Chrome', 'Firefox']))
+        with self.assertRaises(druidry.errors.DruidQueryError):
+            druidry.filters.InFilter(dimension='browser', values='Chrome')
+
+    def test_negate_filter(self):
+        negated_filter = druidry.filters.Filter.negate_filter({'type': 'selector', 'dimension': 'a', 'value': 'b'})
+        self.assertIsInstance(negated_filter, druidry.filters.Filter)
+        self.assertEqual(negated_filter.type, 'not')
+        with self.assertRaises(druidry.errors.DruidQueryError):
+            druidry.filters.Filter.negate_filter('a')
+
     def test_create(self):
         filter_ = druidry.filters.SelectorFilter(dimension='is_active', value='t')
         self.assertEqual(filter_, {
@@ -68,6 +89,25 @@ class FilterTest(unittest.TestCase):
             'type': 'or'
         })
 
+    def test_join_is_filter(self):
+        active_filter = druidry.filters.SelectorFilter(dimension='is_active', value='t')
+        browser_filter = druidry.filters.SelectorFilter(dimension='browser', value='Chrome')
+        joined_filter = druidry.filters.Filter.join_filters(active_filter, None, browser_filter)
+        self.assertIsInstance(joined_filter, druidry.filters.Filter)
+        self.assertEqual(joined_filter.type, 'and')
+        self.assertEqual(joined_filter.negate(), {'type': 'not', 'field': joined_filter})
+        self.assertIs(druidry.filters.Filter.join_filters(None, active_filter), active_filter)
+
+    def test_join_nested_and(self):
+        active_filter = druidry.filters.SelectorFilter(dimension='is_active', value='t')
+        browser_filter = druidry.filters.SelectorFilter(dimension='browser', value='Chrome')
+        page_filter = druidry.filters.SelectorFilter(dimension='page', value='Home')
+        either_filter = druidry.filters.Filter.disjoin_filters(browser_filter, page_filter)
+        joined_filter = druidry.filters.Filter.join_filters(
+            druidry.filters.Filter.join_filters(active_filter, either_filter), browser_filter)
+        self.assertEqual(joined_filter, druidry.filters.AndFilter(
+            fields=[active_filter, either_filter, browser_filter]))
+
     def test_create_selector_filter(self):
         self.assertEqual(
             druidry.filters.SelectorFilter(dimension='is_active', value='t'),
@@ -1,5 +1,6 @@
 from .context import druidry
 import datetime
+import mock
 import unittest
 
 
@@ -8,6 +9,8 @@ class GranularityTest(unittest.TestCase):
     def test_invalid_simple_granularity(self):
         with self.assertRaises(ValueError):
             druidry.granularities.SimpleGranularity('INVALID')
+        with self.assertRaises(ValueError):
+            druidry.granularities.SimpleGranularity(['day'])
 
     def test_valid_simple_granularity(self):
         self.assertEqual(druidry.granularities.SimpleGranularity('day'), 'day')
@@ -70,6 +73,9 @@ class GranularityTest(unittest.TestCase):
     def test_invalid_time_zone_granularity(self):
         with self.assertRaises(ValueError):
             druidry.granularities.PeriodGranularity(period='P2Y', time_zone='Lilliput/Mildendo')
+        # Only valid time zones are cached, so this fails again.
+        with self.assertRaises(ValueError):
+            druidry.granularities.PeriodGranularity(period='P2Y', time_zone='Lilliput/Mildendo')
 
     def test_invalid_period_granularity(self):
         with self.assertRaises(ValueError):
@@ -104,3 +110,22 @@ class GranularityTest(unittest.TestCase):
         self.assertEqual(
             druidry.granularities.granularity_to_timedelta(simple_granularity),
             datetime.timedelta(minutes=30))
+
+    def test_granularity_timedelta_static_other(self):
+        self.assertEqual(
+            druidry.granularities.granularity_to_timedelta(druidry.granularities.SimpleGranularity('hour')),
+            datetime.timedelta(hours=1))
+        self.assertIsNone(druidry.granularities.granularity_to_timedelta({'type': 'uniform'}))
+        self.assertIsNone(druidry.granularities.granularity_to_timedelta(None))
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(druidry.granularities.PeriodGranularity(period='PT1H'), '__dict__'))
+        self.assertFalse(hasattr(druidry.granularities.DurationGranularity(duration=1000), '__dict__'))
+        self.assertFalse(hasattr(druidry.granularities.SimpleGranularity('day'), '__dict__'))
+
+    def test_period_granularity_parsed_once(self):
+        parse_duration = druidry.durations.isodate.parse_duration
+        with mock.patch('druidry.durations.isodate.parse_duration', side_effect=parse_duration) as parse:
+            period_granularity = druidry.granularities.PeriodGranularity(period='PT7H13M')
+            self.assertEqual(period_granularity.to_timedelta(), datetime.timedelta(hours=7, minutes=13))
+        self.assertEqual(parse.call_count, 1)
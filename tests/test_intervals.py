@@ -80,6 +80,15 @@ class IntervalTest(unittest.TestCase):
         td = timedelta(minutes=12)
         self.assertEqual(interval.pad_by_timedelta(td), '2014-09-27T16:22:00/2014-09-30T08:18:00')
 
+    def test_pad_interval_many(self):
+        start = datetime(year=2014, month=9, day=27, hour=16, minute=22, second=47)
+        end = datetime(year=2014, month=9, day=30, hour=8, minute=17, second=2)
+        interval = druidry.intervals.Interval(start=start, end=end)
+        tds = [timedelta(minutes=12), timedelta(hours=12)]
+        self.assertEqual(interval.pad_by_timedeltas(tds), '2014-09-27T16:00:00/2014-09-30T09:00:00')
+        self.assertEqual(
+            interval.pad_by_timedeltas(tds), interval.pad_by_timedelta(tds[0]).pad_by_timedelta(tds[1]))
+
     def test_start_date_and_implicit_end(self):
         start = date(year=1970, month=1, day=1)
         implicit_end = date(year=1975, month=12, day=31)
@@ -106,3 +115,19 @@ class IntervalTest(unittest.TestCase):
         with mock.patch('druidry.intervals._datetime_now', return_value=implicit_end):
             interval = druidry.intervals.Interval(weeks=1)
         self.assertEqual(interval, 'P7D/1970-01-01')
+
+    def test_end_only(self):
+        with self.assertRaises(ValueError):
+            druidry.intervals.Interval(end=date(year=1970, month=1, day=1))
+        interval = druidry.intervals.Interval(interval='P5Y/2014-09-27', end=date(year=1970, month=1, day=1))
+        self.assertEqual(interval, 'P5Y/2014-09-27')
+
+    def test_datetime_subclass(self):
+        class Timestamp(datetime):
+            pass
+
+        interval = druidry.intervals.Interval(
+            start=Timestamp(year=2014, month=9, day=20), end=Timestamp(year=2014, month=9, day=27))
+        self.assertEqual(interval, '2014-09-20T00:00:00/2014-09-27T00:00:00')
+        with self.assertRaises(ValueError):
+            druidry.intervals.Interval(interval=42)
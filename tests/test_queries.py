@@ -1,5 +1,6 @@
 from .context import druidry
 import datetime
+import mock
 import unittest
 
 
@@ -140,3 +141,107 @@ class QueryTestCase(unittest.TestCase):
 
         query_2 = druidry.queries.TimeBoundaryQuery()
         self.assertEqual(query_2, {'queryType': 'timeBoundary'})
+
+    def test_extend(self):
+        query = druidry.queries.TimeseriesQuery(
+            data_source='users', granularity='day', aggregations=[], intervals='2018-01-01/P1D')
+        extended = query.extend(granularity='hour', context={'timeout': 1})
+        self.assertEqual(type(extended), druidry.queries.Query)
+        self.assertEqual(extended, dict(query, granularity='hour', context={'timeout': 1}))
+        self.assertEqual(query['granularity'], 'day')
+
+        with self.assertRaises(druidry.errors.DruidQueryError):
+            query.extend(granularity=1)
+
+    def test_copy_context(self):
+        query = druidry.queries.TimeseriesQuery(
+            data_source='users', granularity='day', aggregations=[], intervals='2018-01-01/P1D',
+            context={'timeout': 1})
+        query.copy()['context']['a'] = 1
+        query.extend(granularity='hour')['context']['b'] = 2
+        druidry.queries.Query.extend(dict(query), granularity='hour')['context']['c'] = 3
+        query.filter(druidry.filters.SelectorFilter(dimension='channel', value='en'))['context']['d'] = 4
+        self.assertEqual(query['context'], {'timeout': 1})
+
+    def test_validate_query_json(self):
+        query = {'queryType': 'timeBoundary', 'dataSource': 'users', 'context': {'timeout': 1, 'ids': (1, None)}}
+        self.assertIsNone(druidry.queries.Query.validate_query_json(query))
+        self.assertIn(
+            'JSON serializable',
+            druidry.queries.Query.validate_query_json(dict(query, intervals=datetime.date(2018, 1, 1))))
+
+    def test_validate_query_json_keys(self):
+        query = {'queryType': 'timeBoundary', 'dataSource': 'users', 'context': {1: 'x'}}
+        self.assertFalse(druidry.queries._is_json_tree(query))
+        with mock.patch.object(druidry.queries, 'orjson') as orjson:
+            orjson.dumps.side_effect = TypeError('Dict key must be str')
+            self.assertIn('Dict key must be str', druidry.queries.Query.validate_query_json(query))
+
+    def test_validate_query(self):
+        with mock.patch.object(druidry.queries.Query, 'validate_query_json', return_value='error') as validator:
+            with self.assertRaises(druidry.errors.DruidQueryError):
+                druidry.queries.Query.validate_query({'queryType': 'timeBoundary', 'dataSource': 'users'})
+        validator.assert_called_once()
+
+    def test_query_type(self):
+        query = druidry.queries.TimeBoundaryQuery()
+        self.assertEqual(query['queryType'], druidry.queries.TimeBoundaryQuery.query_type)
+        self.assertIsNone(druidry.queries.Query.query_type)
+
+    def test_validate_query_json_orjson(self):
+        query = {'queryType': 'timeBoundary', 'dataSource': 'users'}
+        with mock.patch.object(druidry.queries, 'orjson') as orjson:
+            orjson.dumps.side_effect = TypeError('Type is not JSON serializable: date')
+            self.assertIsNone(druidry.queries.Query.validate_query_json(query))
+            orjson.dumps.assert_not_called()
+            self.assertIn(
+                'JSON serializable',
+                druidry.queries.Query.validate_query_json(dict(query, intervals=datetime.date(2018, 1, 1))))
+            orjson.dumps.assert_called_once()
+
+    def test_no_instance_dict(self):
+        query = druidry.queries.TimeBoundaryQuery()
+        self.assertFalse(hasattr(query, '__dict__'))
+        self.assertFalse(hasattr(query.extend(bound='maxTime'), '__dict__'))
+
+    def test_filter(self):
+        selector = druidry.filters.SelectorFilter(dimension='os', value='mac')
+        query = druidry.queries.TimeseriesQuery(
+            data_source='users', granularity='day', aggregations=[], intervals='2018-01-01/P1D', filter=selector)
+        filtered = query.filter(druidry.filters.SelectorFilter(dimension='browser', value='chrome'))
+        self.assertEqual(filtered['filter']['type'], 'and')
+        self.assertEqual(query['filter'], selector)
+
+        filtered = druidry.queries.TimeseriesQuery.filter_query(
+            query, druidry.filters.SelectorFilter(dimension='browser', value='chrome'))
+        self.assertEqual(type(filtered), druidry.queries.TimeseriesQuery)
+        self.assertEqual(filtered['filter']['type'], 'and')
+        self.assertEqual(query['filter'], selector)
+        self.assertEqual(
+            druidry.queries.TimeseriesQuery.filter_query(dict(query), selector),
+            dict(query, filter=druidry.filters.Filter.join_filters(selector, selector)))
+
+    def test_argument_type_errors(self):
+        with self.assertRaisesRegex(ValueError, '`aggregations` is required to be a list'):
+            druidry.queries.TimeseriesQuery(granularity='day', intervals='2018-01-01/P1D')
+        with self.assertRaisesRegex(ValueError, '`threshold` must be an int'):
+            druidry.queries.TopNQuery(
+                aggregations=[], dimension='os', granularity='day', intervals='2018-01-01/P1D', metric='users',
+                threshold='10')
+        with self.assertRaises(druidry.errors.DruidQueryError):
+            druidry.queries.Query(query_type='timeseries', granularity='day', intervals='2018-01-01/P1D')
+
+    def test_validate_query_type(self):
+        self.assertIsNone(druidry.queries.Query.validate_query_type({'queryType': 'topN'}))
+        self.assertEqual(
+            druidry.queries.Query.validate_query_type({'queryType': 'WHY???'}),
+            'Invalid queryType "WHY???". Valid query types: '
+            'dataSourceMetadata, groupBy, segmentMetadata, timeBoundary, timeseries, topN')
+        self.assertIsNotNone(druidry.queries.Query.validate_query_type({'queryType': ['topN']}))
+
+    def test_subquery_data_source(self):
+        subquery = druidry.queries.Query(query_type='timeBoundary', data_source='users')
+        data_source = druidry.typeddict.ExtendableDict(type='query', query=subquery)
+        query = druidry.queries.Query(query_type='timeBoundary', data_source=data_source)
+        self.assertIs(druidry.queries.Query.get_subquery(query), subquery)
+        self.assertIsNone(druidry.queries.Query.validate_data_source(query))
@@ -1,5 +1,6 @@
 from .context import druidry
 import datetime
+import mock
 import pandas as pd
 import unittest
 
@@ -215,3 +216,55 @@ class TestQueryResult(unittest.TestCase):
         ]
         with self.assertRaises(ValueError):
             druidry.results.QueryResult(query, result)
+
+    def test_scan_rows(self):
+        query = druidry.queries.ScanQuery(data_source='users', intervals='2018-01-01/P1D', columns=['os', 'users'])
+        result = [
+            {'columns': ['os', 'users'], 'events': [['mac', 1], ['linux', 2]]},
+            {'columns': ['os', 'users'], 'events': [{'os': 'windows', 'users': 3}]},
+        ]
+        query_result = druidry.results.QueryResult(query, result)
+        self.assertEqual(list(query_result.rows), [
+            {'os': 'mac', 'users': 1}, {'os': 'linux', 'users': 2}, {'os': 'windows', 'users': 3}])
+        self.assertEqual(query_result.index, [])
+        self.assertIs(query_result.index, query_result.index)
+
+    def test_scan_dataframe(self):
+        query = druidry.queries.ScanQuery(data_source='users', intervals='2018-01-01/P1D')
+        result = [{'columns': ['__time', 'os'], 'events': [['2018-01-01T00:00:00Z', 'mac'], ['2018-01-01T01:00:00Z', 'linux']]}]
+        df = druidry.results.QueryResult(query, result).to_dataframe()
+        self.assertEqual(list(df['os']), ['mac', 'linux'])
+        self.assertEqual(list(df.index), list(pd.to_datetime(['2018-01-01T00:00:00Z', '2018-01-01T01:00:00Z'])))
+
+    def test_topn_records(self):
+        query = druidry.queries.TopNQuery(
+            data_source='users', aggregations=[], dimension='os', granularity='day',
+            intervals='2018-01-01/P2D', metric='users', threshold=2)
+        result = [
+            {'timestamp': '2018-01-01T00:00:00Z', 'result': [{'os': 'mac', 'users': 2}, {'os': 'linux', 'users': 1}]},
+            {'timestamp': '2018-01-02T00:00:00Z', 'result': [{'os': 'mac', 'users': 3}]},
+        ]
+        df = druidry.results.QueryResult(query, result).to_dataframe()
+        self.assertEqual(list(df['users']), [2, 1, 3])
+        self.assertEqual(list(df.index.get_level_values('os')), ['mac', 'linux', 'mac'])
+        self.assertEqual(
+            list(df.index.get_level_values('timestamp')),
+            list(pd.to_datetime(['2018-01-01T00:00:00Z', '2018-01-01T00:00:00Z', '2018-01-02T00:00:00Z'])))
+
+    def test_requires_pandas(self):
+        query = druidry.queries.ScanQuery(data_source='users', intervals='2018-01-01/P1D')
+        with mock.patch.object(druidry.results, 'pd', None), \
+                mock.patch.object(druidry.results.importlib.util, 'find_spec', return_value=None):
+            with self.assertRaises(Exception):
+                druidry.results.QueryResult(query, [])
+
+    def test_records_share_timestamps(self):
+        query = druidry.queries.TopNQuery(
+            data_source='users', aggregations=[], dimension='os', granularity='day',
+            intervals='2018-01-01/P1D', metric='users', threshold=2)
+        result = [
+            {'timestamp': '2018-01-01T00:00:00Z', 'result': [{'os': 'mac', 'users': 2}, {'os': 'linux', 'users': 1}]},
+        ]
+        records = druidry.results.QueryResult(query, result).records
+        self.assertEqual(records[0], {'timestamp': pd.Timestamp('2018-01-01T00:00:00Z'), 'os': 'mac', 'users': 2})
+        self.assertIs(records[0]['timestamp'], records[1]['timestamp'])
@@ -88,6 +88,48 @@ class TestTypedDict(unittest.TestCase):
         result_2 = MultipleTypesFieldsDict('dict_type', required_field={'a': 'z'})
         self.assertEqual(result_2, {'required_field': {'a': 'z'}})
 
+    def test_tuple_types_field(self):
+        class TupleTypesFieldsDict(druidry.typeddict.TypedDict):
+            required_fields = {
+                'dict_type': {
+                    'required_field': (list, dict)
+                }
+            }
+
+        result = TupleTypesFieldsDict('dict_type', required_field={'a': 'z'})
+        self.assertEqual(result, {'required_field': {'a': 'z'}})
+        with self.assertRaises(druidry.errors.DruidQueryError):
+            TupleTypesFieldsDict('dict_type', required_field='a')
+
+    def test_mismatched_type_field(self):
+        class RequiredFieldsDict(druidry.typeddict.TypedDict):
+            required_fields = {
+                'dict_type': {
+                    'required_field': [list, dict]
+                }
+            }
+
+        with self.assertRaises(druidry.errors.DruidQueryError):
+            RequiredFieldsDict('dict_type', required_field='a')
+        # The compiled field specs are reused, so validation fails the same way again.
+        with self.assertRaises(druidry.errors.DruidQueryError):
+            RequiredFieldsDict('dict_type', required_field='a')
+        self.assertEqual(RequiredFieldsDict('dict_type', required_field=[1]), {'required_field': [1]})
+
+    def test_lookup_type_once(self):
+        class CountingDict(druidry.typeddict.TypedDict):
+            required_fields = {'dict_type': {'required_field': int}}
+            optional_fields = {'dict_type': {'optional_field': int}}
+            lookups = []
+
+            def _get_lookup_type(self):
+                self.lookups.append(self.type)
+                return self.type
+
+        result = CountingDict('dict_type', required_field=1, optional_field=2)
+        self.assertEqual(result, {'required_field': 1, 'optional_field': 2})
+        self.assertEqual(CountingDict.lookups, ['dict_type'])
+
     def test_extend(self):
         d = druidry.typeddict.ExtendableDict({'a': 1, 'b': 2})
         self.assertEqual(d.extend(c=3), {'a': 1, 'b': 2, 'c': 3})
@@ -96,6 +138,20 @@ class TestTypedDict(unittest.TestCase):
         d = druidry.typeddict.ExtendableDict({'a': 1, 'b': 2, 'c': 3})
         self.assertEqual(d.extend(c=4), {'a': 1, 'b': 2, 'c': 4})
 
+    def test_copy(self):
+        d = druidry.typeddict.ExtendableDict({'a': [1]})
+        self.assertIs(d.copy()['a'], d['a'])
+        self.assertEqual(d.deep_copy(), d)
+        self.assertIsNot(d.deep_copy()['a'], d['a'])
+
+    def test_copy_typed(self):
+        class OneTypeDict(druidry.typeddict.TypedDict):
+            required_fields = {'valid': {}}
+
+        d = OneTypeDict('valid')
+        self.assertEqual(d.copy().type, 'valid')
+        self.assertEqual(type(d.copy()), OneTypeDict)
+
     def test_extend_by(self):
         d = druidry.typeddict.ExtendableDict({'a': 1, 'b': 2})
         self.assertEqual(d.extend_by({'c': 3}), {'a': 1, 'b': 2, 'c': 3})